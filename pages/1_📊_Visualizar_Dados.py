@@ -1,6 +1,8 @@
 import streamlit as st
 from utils.vendas.data_manager import initialize_session_data
 from utils.leads.leads_manager import initialize_leads_data
+from utils.import_helpers import get_session_df, save_to_session
+from utils.core.dtypes import decode_categories
 
 # Inicializar dados
 initialize_session_data()
@@ -33,11 +35,13 @@ tabs = st.tabs(tab_titles)
 for tab, config in zip(tabs, TAB_CONFIGS):
     with tab:
         st.subheader(config["subheader"])
+        # Categorias voltam a texto para permitir digitar valores novos
+        current_data = decode_categories(get_session_df(config["data_key"]))
         edited_data = st.data_editor(
-            st.session_state[config["data_key"]],
+            current_data,
             use_container_width=True,
             num_rows="dynamic",
             key=f"editor_{config['key']}"
         )
-        if edited_data is not None:
-            st.session_state[config["data_key"]] = edited_data
\ No newline at end of file
+        if edited_data is not None and not edited_data.equals(current_data):
+            save_to_session(config["data_key"], edited_data)
\ No newline at end of file
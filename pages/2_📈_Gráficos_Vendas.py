@@ -96,25 +96,18 @@ class VendasDashboard:
             st.info("📝 Nenhum dado geográfico disponível")
             return
             
-        # Abas para diferentes visualizações de mapa
-        tab1, tab2, tab3 = st.tabs([
-            "🗺️ Mapa do Brasil", "📊 Ranking", "📍 Regiões"
-        ])
-        
-        with tab1:
-            # ✅ MÉTODO CORRETO: create_brazil_map
-            fig = VendasCharts.create_brazil_map(self.dfs['estados'])
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with tab2:
-            # ✅ MÉTODO CORRETO: create_states_bar_chart
-            fig = VendasCharts.create_states_bar_chart(self.dfs['estados'])
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            # ✅ MÉTODO CORRETO: create_regions_pie_chart
-            fig = VendasCharts.create_regions_pie_chart(self.dfs['estados'])
-            st.plotly_chart(fig, use_container_width=True)
+        # Abas para diferentes visualizações de mapa (renderizadas sob demanda)
+        UIComponents.lazy_tabs({
+            "🗺️ Mapa do Brasil": lambda: st.plotly_chart(
+                VendasCharts.create_brazil_map(self.dfs['estados']), use_container_width=True
+            ),
+            "📊 Ranking": lambda: st.plotly_chart(
+                VendasCharts.create_states_bar_chart(self.dfs['estados']), use_container_width=True
+            ),
+            "📍 Regiões": lambda: st.plotly_chart(
+                VendasCharts.create_regions_pie_chart(self.dfs['estados']), use_container_width=True
+            )
+        }, key="vendas_tabs_geografia")
 
     def render_brand_analysis(self) -> None:
         """Renderiza análise por marca"""
@@ -187,25 +180,14 @@ class VendasDashboard:
             st.warning("⚠️ Nenhum dado disponível. Por favor, carregue os dados na página 'Dados'.")
             return
         
-        # Abas organizadas
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
-            "📈 Mensal", "🗺️ Estados", "🚗 Marcas", "🏪 Lojas", "📱 Visitas"
-        ])
-        
-        with tab1:
-            self.render_monthly_performance()
-        
-        with tab2:
-            self.render_geographic_analysis()
-        
-        with tab3:
-            self.render_brand_analysis()
-        
-        with tab4:
-            self.render_store_analysis()
-        
-        with tab5:
-            self.render_visits_analysis()
+        # Abas organizadas: apenas a aba aberta calcula análises e gráficos
+        UIComponents.lazy_tabs({
+            "📈 Mensal": self.render_monthly_performance,
+            "🗺️ Estados": self.render_geographic_analysis,
+            "🚗 Marcas": self.render_brand_analysis,
+            "🏪 Lojas": self.render_store_analysis,
+            "📱 Visitas": self.render_visits_analysis
+        }, key="vendas_tabs")
 
 def main():
     """Função principal do dashboard de vendas"""
@@ -250,38 +250,18 @@ class LeadsDashboard:
             st.warning("⚠️ Nenhum dado disponível. Por favor, carregue os dados na página 'Dados'.")
             return
         
-        # Abas organizadas - AGORA COM DASHBOARDS
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
-            "📊 Demográfico", "🚗 Veículos", "👥 Gênero", "💼 Status", "🎂 Idade", 
-            "💰 Salário", "🚗 Tipo Veículo", "📅 Idade Veículo", "🏆 Top Veículos"
-        ])
-        
-        with tab1:
-            self.render_demographic_dashboard()
-        
-        with tab2:
-            self.render_vehicle_preference_dashboard()
-        
-        with tab3:
-            self.render_gender_analysis()
-        
-        with tab4:
-            self.render_professional_status()
-        
-        with tab5:
-            self.render_age_distribution()
-        
-        with tab6:
-            self.render_salary_distribution()
-        
-        with tab7:
-            self.render_vehicle_classification()
-        
-        with tab8:
-            self.render_vehicle_age_preference()
-        
-        with tab9:
-            self.render_top_vehicles()
+        # Abas organizadas: apenas a aba aberta calcula análises e gráficos
+        UIComponents.lazy_tabs({
+            "📊 Demográfico": self.render_demographic_dashboard,
+            "🚗 Veículos": self.render_vehicle_preference_dashboard,
+            "👥 Gênero": self.render_gender_analysis,
+            "💼 Status": self.render_professional_status,
+            "🎂 Idade": self.render_age_distribution,
+            "💰 Salário": self.render_salary_distribution,
+            "🚗 Tipo Veículo": self.render_vehicle_classification,
+            "📅 Idade Veículo": self.render_vehicle_age_preference,
+            "🏆 Top Veículos": self.render_top_vehicles
+        }, key="leads_tabs")
 
 def main():
     """Função principal do dashboard"""
@@ -1,28 +1,36 @@
 """
 Utils package for Streamlit dashboard application.
 Contains core functionality and module-specific utilities.
+
+Os nomes abaixo são importados sob demanda (__getattr__), de modo que
+análises, gráficos e a CLI (python -m utils.cli) rodam sem Streamlit.
 """
 
-from .core.session_manager import SessionManager
-from .core.validation import DataValidator
-from .components import UIComponents  # ✅ CORRETO
-from .import_helpers import (
-    get_session_df, 
-    save_to_session, 
-    clear_session_data,
-    get_session_value,
-    set_session_value,
-    initialize_session_defaults
-)
+import importlib
+
+_EXPORTS = {
+    'SessionManager': '.core.session_manager',
+    'DataValidator': '.core.validation',
+    'UIComponents': '.components',  # ✅ CORRETO
+    'get_dataset_store': '.import_helpers',
+    'get_session_df': '.import_helpers',
+    'get_session_fingerprint': '.import_helpers',
+    'save_to_session': '.import_helpers',
+    'append_to_session': '.import_helpers',
+    'upsert_to_session': '.import_helpers',
+    'preview_upsert': '.import_helpers',
+    'clear_session_data': '.import_helpers',
+    'get_session_value': '.import_helpers',
+    'set_session_value': '.import_helpers',
+    'initialize_session_defaults': '.import_helpers'
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'SessionManager', 
-    'DataValidator', 
-    'UIComponents',
-    'get_session_df',
-    'save_to_session', 
-    'clear_session_data',
-    'get_session_value',
-    'set_session_value',
-    'initialize_session_defaults'
-]
\ No newline at end of file
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
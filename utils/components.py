@@ -5,7 +5,10 @@ Componentes de UI reutilizáveis para o dashboard
 import streamlit as st
 import pandas as pd
 from typing import Optional, Dict, Any, List, Callable
-from .import_helpers import get_session_df, save_to_session
+from .import_helpers import get_dataset_store, get_session_df, save_to_session, append_to_session
+from .core.export import csv_download
+from .core.dtypes import decode_categories
+from .core.preview import PAGE_SIZES, PAGES, PREVIEW_MODES, PREVIEW_ROWS, column_summary, preview_rows
 
 class UIComponents:
     """Componentes de interface do usuário reutilizáveis"""
@@ -58,8 +61,7 @@ class UIComponents:
         with col1:
             if editable and st.button("➕ Adicionar Linha", key=f"add_{data_key}"):
                 new_row = {col: "" for col in df.columns} if not df.empty else {}
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                save_to_session(data_key, df)
+                append_to_session(data_key, pd.DataFrame([new_row], columns=df.columns))
                 st.rerun()
         
         with col2:
@@ -69,10 +71,11 @@ class UIComponents:
                 st.rerun()
         
         with col3:
-            if not df.empty:
+            table = get_dataset_store().get_table(data_key)
+            if not df.empty and table is not None:
                 st.download_button(
                     "📥 Exportar CSV",
-                    df.to_csv(index=False),
+                    csv_download(table),
                     f"{data_key}.csv",
                     "text/csv"
                 )
@@ -80,6 +83,8 @@ class UIComponents:
         # Exibir tabela
         if not df.empty:
             if editable:
+                # Categorias voltam a texto para permitir digitar valores novos
+                df = decode_categories(df)
                 edited_df = st.data_editor(
                     df,
                     use_container_width=True,
@@ -91,7 +96,7 @@ class UIComponents:
                     save_to_session(data_key, edited_df)
                     st.success("✅ Alterações salvas!")
             else:
-                st.dataframe(df, use_container_width=True)
+                UIComponents.data_preview(df, key=f"preview_{data_key}")
         else:
             st.info("📝 Nenhum dado disponível. Adicione dados para começar.")
     
@@ -216,4 +221,55 @@ class UIComponents:
         """
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         func()
-        st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    @staticmethod
+    def lazy_tabs(sections: Dict[str, Callable[[], None]], key: str) -> None:
+        """
+        Abas com renderização sob demanda: apenas a aba selecionada executa
+        sua função (análises e gráficos); as demais só rodam ao serem abertas
+        """
+        labels = list(sections.keys())
+        try:
+            tabs = st.tabs(labels, key=key, on_change="rerun")
+        except TypeError:
+            # Versões do Streamlit sem abas com estado: seletor horizontal
+            selected = st.radio(key, labels, horizontal=True, key=key, label_visibility="collapsed")
+            sections[selected]()
+            return
+        
+        for label, tab in zip(labels, tabs):
+            if tab.open:
+                with tab:
+                    sections[label]()
+    
+    @staticmethod
+    def data_preview(df: pd.DataFrame, key: str, rows: int = PREVIEW_ROWS, show_summary: bool = True) -> None:
+        """
+        Pré-visualização limitada: envia ao navegador apenas início, fim,
+        amostra ou uma página da tabela, mais o resumo por coluna
+        """
+        total = len(df)
+        if total == 0:
+            st.info("Nenhum dado disponível atualmente")
+            return
+        
+        if total <= rows:
+            st.dataframe(df, use_container_width=True)
+        else:
+            mode = st.radio("Visualizar:", PREVIEW_MODES, horizontal=True, key=f"{key}_modo")
+            page_size, page = rows, 0
+            if mode == PAGES:
+                col1, col2 = st.columns(2)
+                with col1:
+                    page_size = st.selectbox("Registros por página", PAGE_SIZES, key=f"{key}_tamanho")
+                pages = -(-total // page_size)
+                with col2:
+                    page = st.number_input(f"Página (de {pages:,})", min_value=1, max_value=pages, value=1, key=f"{key}_pagina") - 1
+            shown = preview_rows(df, mode, page_size, page)
+            st.dataframe(shown, use_container_width=True)
+            st.caption(f"Exibindo {len(shown):,} de {total:,} registros")
+        
+        if show_summary:
+            with st.expander("📊 Resumo das colunas"):
+                st.dataframe(column_summary(df), use_container_width=True, hide_index=True)
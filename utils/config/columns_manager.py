@@ -1,6 +1,6 @@
 import streamlit as st
 from utils.core.session_manager import SessionManager
-from utils.import_helpers import get_session_df 
+from utils.import_helpers import get_session_df, get_dataset_store, save_to_session
 from utils.core.validation import DataValidator 
 from utils.components import UIComponents 
 
@@ -55,7 +55,7 @@ class ColumnsManager:
     @staticmethod
     def _add_column(data_key: str, nome_coluna: str, tipo_coluna: str):
         try:
-            if data_key not in st.session_state:
+            if data_key not in get_dataset_store():
                 st.error(f"❌ Tabela não encontrada")
                 return
             
@@ -66,9 +66,10 @@ class ColumnsManager:
             elif tipo_coluna == "Booleano":
                 valor_padrao = False
             
-            # Adicionar coluna
-            novos_dados = [dict(registro, **{nome_coluna: valor_padrao}) for registro in st.session_state[data_key]]
-            st.session_state[data_key] = novos_dados
+            # Adicionar coluna (gera nova versão da tabela)
+            novos_dados = get_dataset_store().get_frame(data_key)
+            novos_dados[nome_coluna] = valor_padrao
+            save_to_session(data_key, novos_dados)
             
             st.success(f"✅ Coluna '{nome_coluna}' adicionada com sucesso!")
             st.rerun()
@@ -1,6 +1,7 @@
 import streamlit as st
 from utils.core.session_manager import SessionManager  # ✅ CORRETO
-from utils.import_helpers import get_session_df  # ✅ CORRETO
+from utils.import_helpers import get_dataset_store  # ✅ CORRETO
+from utils.core.export import bundle_download, csv_download, xlsx_download
 
 class ExportManager:
     """Gerencia exportação de dados"""
@@ -16,6 +17,55 @@ class ExportManager:
         
         with tab_leads:
             ExportManager._render_category('leads')
+        
+        st.divider()
+        ExportManager._render_bundle()
+    
+    @staticmethod
+    def _render_bundle():
+        """Todas as tabelas em um único ZIP (Parquet ou CSV) com manifesto"""
+        st.markdown("### 📦 Exportar Tudo")
+        
+        configs = [config for category in SessionManager.get_table_configs().values() for config in category]
+        store = get_dataset_store()
+        tables = {}
+        for config in configs:
+            table = store.get_table(config["data_key"])
+            if table is not None:
+                tables[config["data_key"]] = table
+        
+        if not tables:
+            st.info("Nenhum dado disponível para exportar")
+            return
+        
+        col_format, col_button = st.columns([1, 2])
+        with col_format:
+            file_format = st.radio(
+                "Formato", ["parquet", "csv"],
+                format_func=lambda fmt: "Parquet" if fmt == "parquet" else "CSV",
+                horizontal=True, key="export_bundle_format"
+            )
+        with col_button:
+            total_rows = sum(len(table) for table in tables.values())
+            st.caption(f"{len(tables)} tabelas · {total_rows:,} registros · inclui manifest.json com colunas e tipos")
+            # ZIP gerado apenas no clique; as tabelas são serializadas em paralelo
+            st.download_button(
+                label="📦 Baixar todas as tabelas (.zip)",
+                data=bundle_download(tables, file_format),
+                file_name=f"dados_{file_format}.zip",
+                mime="application/zip",
+                key="export_bundle",
+                use_container_width=True
+            )
+            # Uma aba por tabela, gravada em streaming (memória constante)
+            st.download_button(
+                label="📗 Baixar planilha Excel (.xlsx)",
+                data=xlsx_download(tables),
+                file_name="dados.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key="export_xlsx",
+                use_container_width=True
+            )
     
     @staticmethod
     def _render_category(category: str):
@@ -25,14 +75,13 @@ class ExportManager:
         cols = st.columns(2)
         for idx, config in enumerate(configs):
             with cols[idx % 2]:
-                df = get_session_df(config["data_key"])
+                table = get_dataset_store().get_table(config["data_key"])
                 
-                # Botão de download simplificado (substituindo download_csv_button)
-                if not df.empty:
-                    csv_data = df.to_csv(index=False)
+                # CSV gerado apenas no clique (em cache pela versão dos dados)
+                if table is not None and len(table) > 0:
                     st.download_button(
                         label=f"📥 {config['title']}",
-                        data=csv_data,
+                        data=csv_download(table),
                         file_name=f"{config['data_key']}.csv",
                         mime="text/csv",
                         key=f"export_{config['key']}",
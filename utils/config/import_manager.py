@@ -1,24 +1,65 @@
+import os
 import pandas as pd
 import streamlit as st
 from utils.core.session_manager import SessionManager  # ✅ CORRETO
-from utils.import_helpers import get_session_df, save_to_session  # ✅ CORRETO
-from utils.core.validation import DataValidator  # ✅ CORRETO
+from utils.import_helpers import get_session_df, save_to_session, append_to_session, upsert_to_session, preview_upsert  # ✅ CORRETO
+from utils.core.validation import PARALLEL_MIN_WORKERS, DataValidator  # ✅ CORRETO
 from utils.components import UIComponents  # ✅ CORRETO
+from utils.core.facts import FACT_SCHEMAS, FactAggregator
+from utils.core.dataset_store import SHARED_DATASETS, ColumnarTable
+from utils.core.ingest import (
+    MANIFEST_NAME, IngestManifest, ingest_directory, match_data_key, pending_files, resolve_watch_path, watch_subfolders
+)
+from utils.core.jobs import ImportJob, JobRegistry
+from utils.core.readers import SUPPORTED_EXTENSIONS, archive_members, is_archive, open_member, read_frame
+from utils.core.streaming import stream_import
+from utils.core.streaming import DEFAULT_CHUNK_ROWS
 
 class ImportManager:
     """Gerencia importação de dados"""
     
+    CHUNK_ROWS = DEFAULT_CHUNK_ROWS
+    # Arquivos grandes são validados em paralelo (IMPORT_WORKERS < PARALLEL_MIN_WORKERS desativa)
+    # ~2 milhões de linhas (PARALLEL_MIN_ROWS) em um CSV de ~60 bytes por linha
+    PARALLEL_MIN_BYTES = 128 * 1024 * 1024
+    VALIDATION_WORKERS = int(os.environ.get("IMPORT_WORKERS", os.cpu_count() or 1))
+    JOBS_KEY = "_import_jobs"
+    JOB_POLL_SECONDS = 1.0
+    # Pasta de extrações monitorada (cargas noturnas por tabela)
+    WATCH_DIR = os.environ.get("IMPORT_WATCH_DIR", "")
+    WATCH_SECONDS = int(os.environ.get("IMPORT_WATCH_SECONDS", 60))
+    
     @staticmethod
     def render():
         st.subheader("📥 Importar Dados")
         
-        tab_vendas, tab_leads = st.tabs(["💰 Vendas", "👥 Leads"])
+        active_jobs = ImportManager._get_jobs().active()
+        if active_jobs:
+            st.info("⏳ Importações em andamento: " + ", ".join(
+                f"{job.file_name} → {job.data_key} ({job.rows_validated:,} registros)" for job in active_jobs
+            ))
+        
+        # A aba de pasta só existe com IMPORT_WATCH_DIR configurado (altera as tabelas de todas as sessões)
+        labels = ["💰 Vendas", "👥 Leads", "🧾 Eventos", "📦 Lote (.zip)"]
+        if ImportManager.WATCH_DIR:
+            labels.append("📂 Pasta")
+        tab_vendas, tab_leads, tab_eventos, tab_lote, *tab_pasta = st.tabs(labels)
         
         with tab_vendas:
             ImportManager._render_category('vendas')
         
         with tab_leads:
             ImportManager._render_category('leads')
+        
+        with tab_eventos:
+            ImportManager._render_facts_import()
+        
+        with tab_lote:
+            ImportManager._render_archive_import()
+        
+        if tab_pasta:
+            with tab_pasta[0]:
+                ImportManager._render_folder_ingest()
     
     @staticmethod
     def _render_category(category: str):
@@ -33,87 +74,320 @@ class ImportManager:
         
         ImportManager._render_import_interface(selected_config)
     
+    @staticmethod
+    def _render_facts_import():
+        st.info("Importe eventos individuais de vendas e visitas de leads. As tabelas dados_* são recalculadas a partir deles.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            sales_file = st.file_uploader("📤 Vendas (sales_facts)", type=SUPPORTED_EXTENSIONS, key="file_sales_facts")
+            st.caption(f"Colunas: {', '.join(FACT_SCHEMAS['sales_facts'])}")
+        with col2:
+            lead_file = st.file_uploader("📤 Visitas de leads (lead_facts)", type=SUPPORTED_EXTENSIONS, key="file_lead_facts")
+            st.caption(f"Colunas: {', '.join(FACT_SCHEMAS['lead_facts'])}")
+        
+        if not sales_file and not lead_file:
+            return
+        
+        try:
+            sales_df = read_frame(sales_file) if sales_file else None
+            lead_df = read_frame(lead_file) if lead_file else None
+            datasets = FactAggregator(sales_df, lead_df).aggregate_all()
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+            return
+        except Exception as e:
+            st.error(f"❌ Erro ao processar eventos: {str(e)}")
+            return
+        
+        st.markdown("### 📊 Tabelas Derivadas")
+        st.dataframe(
+            pd.DataFrame([
+                {"tabela": data_key, "descrição": DataValidator.get_table_description(data_key), "registros": len(df)}
+                for data_key, df in datasets.items()
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        st.warning("⚠️ Substituirá as tabelas listadas acima!")
+        if st.button("🔄 Confirmar Importação de Eventos", type="primary", key="confirm_facts"):
+            for data_key, df in datasets.items():
+                save_to_session(data_key, df)
+            st.success(f"✅ {len(datasets)} tabelas recalculadas a partir dos eventos!")
+            st.rerun()
+    
+    @staticmethod
+    def _render_archive_import():
+        st.info(
+            "Importe várias tabelas de uma vez a partir de um .zip. Cada arquivo do .zip é associado à tabela "
+            "pelo nome (ex.: dados_mensais.csv, dados_marcas_2024-10.parquet) e lido descompactando em fluxo."
+        )
+        uploaded_file = st.file_uploader("📤 Arquivo .zip", type=["zip"], key="file_lote_zip")
+        if not uploaded_file:
+            return
+        
+        data_keys = list(DataValidator.get_validations().keys())
+        mapping = [(member, match_data_key(member, data_keys)) for member in archive_members(uploaded_file)]
+        st.dataframe(
+            pd.DataFrame([{"arquivo": member, "tabela": data_key or "❓ não identificada"} for member, data_key in mapping]),
+            use_container_width=True,
+            hide_index=True
+        )
+        mapped = [(member, data_key) for member, data_key in mapping if data_key]
+        if not mapped:
+            st.warning("⚠️ Nenhum arquivo do .zip corresponde a uma tabela")
+            return
+        
+        import_option = st.radio(
+            "Tipo de importação:",
+            ["Substituir Tabela Completa", "Atualizar/Inserir"],
+            horizontal=True,
+            key="option_lote_zip"
+        )
+        if not st.button(f"📦 Importar {len(mapped)} arquivo(s)", type="primary", key="import_lote_zip"):
+            return
+        
+        progress_bar = st.progress(0.0, text="Importando...")
+        results = []
+        for position, (member, data_key) in enumerate(mapped):
+            progress_bar.progress(position / len(mapped), text=f"{member} → {data_key}")
+            result = stream_import(open_member(uploaded_file, member), data_key, chunk_rows=ImportManager.CHUNK_ROWS)
+            summary = {"arquivo": member, "tabela": data_key, "registros": result.rows, "resultado": result.message}
+            if result.is_valid:
+                if import_option == "Atualizar/Inserir":
+                    inserted, updated = upsert_to_session(data_key, result.table.to_frame())
+                    summary["resultado"] = f"✅ {updated} atualizados, {inserted} inseridos"
+                else:
+                    save_to_session(data_key, result.table)
+            results.append(summary)
+        progress_bar.empty()
+        st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+    
+    @staticmethod
+    def _render_folder_ingest():
+        st.info(
+            "Importa as extrações de uma pasta para as tabelas base (todas as sessões). "
+            "Os arquivos são associados à tabela pela subpasta (dados_mensais/arquivo.csv) ou pelo "
+            "prefixo do nome (dados_mensais_2024-10.parquet) e aplicados por Atualizar/Inserir na chave primária. "
+            "Apenas arquivos novos ou alterados são lidos."
+        )
+        root = ImportManager.WATCH_DIR
+        st.text_input("Pasta de importação (IMPORT_WATCH_DIR)", value=root, disabled=True, key="ingest_root")
+        if not os.path.isdir(root):
+            st.error(f"❌ Pasta não encontrada: {root}")
+            return
+        
+        # Apenas a pasta configurada ou uma de suas subpastas
+        subfolder = st.selectbox(
+            "Subpasta", [""] + watch_subfolders(root),
+            format_func=lambda name: name or "(pasta inteira)", key="ingest_subfolder"
+        )
+        try:
+            folder = resolve_watch_path(root, subfolder)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        
+        watch = st.toggle(f"🔁 Verificar automaticamente a cada {ImportManager.WATCH_SECONDS}s", key="ingest_watch")
+        
+        @st.fragment(run_every=ImportManager.WATCH_SECONDS if watch else None)
+        def folder_status():
+            manifest = IngestManifest(os.path.join(folder, MANIFEST_NAME), base_id=SHARED_DATASETS.base_id)
+            pending = pending_files(folder, manifest)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Arquivos já processados", f"{len(manifest.entries):,}")
+            with col2:
+                st.metric("Novos ou alterados", f"{len(pending):,}")
+            
+            run = st.button("📂 Importar novos arquivos", type="primary", key="ingest_run", disabled=not pending)
+            if not (run or (watch and pending)):
+                return
+            progress_bar = st.progress(0.0, text="Importando arquivos...")
+            
+            def on_file(position: int, total: int, path: str):
+                progress_bar.progress(position / total, text=f"{path} ({position + 1}/{total})")
+            
+            results = ingest_directory(folder, chunk_rows=ImportManager.CHUNK_ROWS, on_file=on_file)
+            progress_bar.empty()
+            if results:
+                st.dataframe(pd.DataFrame([result.as_dict() for result in results]), use_container_width=True, hide_index=True)
+        
+        folder_status()
+    
     @staticmethod
     def _render_import_interface(config: dict):
         data_key = config["data_key"]
         
+        import_options = ["Substituir Tabela Completa", "Adicionar Linhas"]
+        primary_key = DataValidator.get_primary_key(data_key)
+        if primary_key:
+            import_options.append("Atualizar/Inserir")
         import_option = st.radio(
             "Tipo de importação:",
-            ["Substituir Tabela Completa", "Adicionar Linhas"],
+            import_options,
             horizontal=True,
-            key=f"option_{data_key}"
+            key=f"option_{data_key}",
+            help=f"Atualizar/Inserir usa a chave primária: {', '.join(primary_key)}" if primary_key else None
         )
         
         # Preview dos dados atuais
         st.markdown("### 📋 Dados Atuais")
         current_df = get_session_df(data_key)
+        UIComponents.data_preview(current_df, key=f"atual_{data_key}")
         if not current_df.empty:
-            st.dataframe(current_df, use_container_width=True)
-            st.write(f"**Total de registros:** {len(current_df)}")
-        else:
-            st.info("Nenhum dado disponível atualmente")
+            st.write(f"**Total de registros:** {len(current_df):,}")
         
         uploaded_file = st.file_uploader(
-            f"📤 Escolher arquivo CSV para {config['title']}",
-            type=['csv'],
+            f"📤 Escolher arquivo para {config['title']}",
+            type=SUPPORTED_EXTENSIONS,
+            help="CSV, Parquet, Feather/Arrow, Excel (.xlsx) ou JSON lines; também compactados (.gz, .zst) ou em .zip",
             key=f"file_{data_key}"
         )
         
         if uploaded_file:
             ImportManager._process_upload(uploaded_file, data_key, config['title'], import_option)
     
+    @staticmethod
+    def _get_jobs() -> JobRegistry:
+        """Registro de importações em segundo plano da sessão"""
+        if ImportManager.JOBS_KEY not in st.session_state:
+            st.session_state[ImportManager.JOBS_KEY] = JobRegistry()
+        return st.session_state[ImportManager.JOBS_KEY]
+    
+    @staticmethod
+    def _get_job(uploaded_file, data_key: str, member: str = None) -> ImportJob:
+        """Job do arquivo enviado; a leitura roda uma única vez por arquivo (reruns reutilizam o job)"""
+        registry = ImportManager._get_jobs()
+        upload_id = (getattr(uploaded_file, "file_id", uploaded_file.name), uploaded_file.size, data_key, member)
+        job = registry.get(data_key)
+        if job is None or job.upload_id != upload_id:
+            parallel = (uploaded_file.size >= ImportManager.PARALLEL_MIN_BYTES
+                        and ImportManager.VALIDATION_WORKERS >= PARALLEL_MIN_WORKERS)
+            workers = ImportManager.VALIDATION_WORKERS if parallel else 1
+            job = registry.submit(
+                data_key, uploaded_file, upload_id, member=member, chunk_rows=ImportManager.CHUNK_ROWS, workers=workers
+            )
+        return job
+    
+    @staticmethod
+    def _select_member(uploaded_file, data_key: str):
+        """Arquivo do .zip a importar: o que tem o nome da tabela, o único existente ou escolha do usuário"""
+        members = archive_members(uploaded_file)
+        if not members:
+            st.error("❌ O arquivo .zip não contém arquivos de dados suportados")
+            return None
+        matching = [member for member in members if match_data_key(member, [data_key])]
+        if len(matching) == 1:
+            return matching[0]
+        if len(members) == 1:
+            return members[0]
+        return st.selectbox("Arquivo do .zip:", options=matching or members, key=f"member_{data_key}")
+    
+    @staticmethod
+    def _render_job_progress(job: ImportJob):
+        """Progresso atualizado periodicamente sem bloquear o restante da página"""
+        @st.fragment(run_every=ImportManager.JOB_POLL_SECONDS)
+        def progress():
+            if job.finished:
+                st.rerun()
+            st.progress(job.fraction, text=f"⏳ {job.file_name}: {job.status}...")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Registros lidos", f"{job.rows_read:,}")
+            with col2:
+                st.metric("Registros validados", f"{job.rows_validated:,}")
+            with col3:
+                st.metric("Tempo", f"{job.elapsed:.0f}s")
+            for warning in job.warnings:
+                st.caption(warning)
+            if st.button("⛔ Cancelar importação", key=f"cancel_{job.id}"):
+                job.cancel()
+                st.rerun()
+        
+        progress()
+    
     @staticmethod
     def _process_upload(uploaded_file, data_key: str, display_name: str, import_option: str):
         try:
-            df_raw = pd.read_csv(uploaded_file)
-            current_df = get_session_df(data_key)
+            member = None
+            if is_archive(uploaded_file.name):
+                member = ImportManager._select_member(uploaded_file, data_key)
+                if member is None:
+                    return
+            job = ImportManager._get_job(uploaded_file, data_key, member)
+            if not job.finished:
+                ImportManager._render_job_progress(job)
+                return
             
-            # Validar estrutura dos dados
-            is_valid, message, df_sanitized = DataValidator.validate_dataframe_structure(df_raw, data_key)
+            if job.status == ImportJob.CANCELLED:
+                st.warning("⛔ Importação cancelada")
+                if st.button("🔁 Reiniciar importação", key=f"restart_{data_key}"):
+                    ImportManager._get_jobs().discard(data_key)
+                    st.rerun()
+                return
             
-            if not is_valid:
-                st.error(f"❌ {message}")
+            if job.status == ImportJob.FAILED:
+                st.error(f"❌ Erro ao processar arquivo: {job.error}")
+                return
+            
+            result = job.result
+            current_df = get_session_df(data_key)
+            
+            if not result.is_valid:
+                st.error(f"❌ {result.message}")
                 return
             
             # Mostrar avisos ou sucesso
-            if "avisos" in message.lower():
-                st.warning(message)
+            if "avisos" in result.message.lower():
+                st.warning(result.message)
             else:
-                st.success(message)
+                st.success(result.message)
             
-            # Preview dos novos dados
+            # Preview dos novos dados (apenas o recorte exibido vai ao navegador)
             st.markdown("### 📊 Novos Dados")
-            st.dataframe(df_sanitized, use_container_width=True)
-            st.write(f"**Registros a importar:** {len(df_sanitized)}")
+            UIComponents.data_preview(result.table.to_frame(), key=f"novos_{data_key}")
+            st.write(f"**Registros a importar:** {result.rows:,} (lidos em {job.elapsed:.1f}s)")
             
-            ImportManager._render_confirmation(data_key, display_name, import_option, current_df, df_sanitized)
+            ImportManager._render_confirmation(data_key, display_name, import_option, current_df, result.table)
             
         except Exception as e:
             st.error(f"❌ Erro ao processar arquivo: {str(e)}")
     
     @staticmethod
-    def _render_confirmation(data_key: str, display_name: str, import_option: str, current_df: pd.DataFrame, new_df: pd.DataFrame):
+    def _render_confirmation(data_key: str, display_name: str, import_option: str, current_df: pd.DataFrame, new_table: ColumnarTable):
         st.markdown("---")
+        new_rows = len(new_table)
         st.markdown("### ✅ Confirmação de Importação")
         
         # Simulação (simplificada)
         if st.button("🎯 Simular Importação", key=f"sim_{data_key}"):
             if import_option == "Substituir Tabela Completa":
-                st.info(f"**Simulação:** Substituirá {len(current_df)} registros por {len(new_df)} novos registros")
+                st.info(f"**Simulação:** Substituirá {len(current_df)} registros por {new_rows} novos registros")
+            elif import_option == "Atualizar/Inserir":
+                inserted, updated = preview_upsert(data_key, new_table.to_frame())
+                st.info(f"**Simulação:** Atualizará {updated} registros e inserirá {inserted} novos")
             else:
-                st.info(f"**Simulação:** Adicionará {len(new_df)} registros aos {len(current_df)} existentes")
+                st.info(f"**Simulação:** Adicionará {new_rows} registros aos {len(current_df)} existentes")
         
         if import_option == "Substituir Tabela Completa":
             st.warning("⚠️ Substituirá todos os dados atuais!")
             if st.button("🔄 Confirmar Substituição", type="primary", key=f"confirm_{data_key}"):
-                save_to_session(data_key, new_df)
+                save_to_session(data_key, new_table)
                 st.success(f"✅ {display_name} substituída com sucesso!")
                 st.rerun()
         
         elif import_option == "Adicionar Linhas":
-            st.info(f"➕ Adicionará {len(new_df)} novas linhas")
+            st.info(f"➕ Adicionará {new_rows} novas linhas")
             if st.button("➕ Adicionar Linhas", type="secondary", key=f"add_{data_key}"):
-                combined_df = pd.concat([current_df, new_df], ignore_index=True)
-                save_to_session(data_key, combined_df)
-                st.success(f"✅ {len(new_df)} linhas adicionadas!")
+                append_to_session(data_key, new_table.to_frame())
+                st.success(f"✅ {new_rows} linhas adicionadas!")
+                st.rerun()
+        
+        elif import_option == "Atualizar/Inserir":
+            st.info("🔑 Linhas com chave existente serão atualizadas; as demais serão inseridas")
+            if st.button("🔑 Atualizar/Inserir", type="secondary", key=f"upsert_{data_key}"):
+                inserted, updated = upsert_to_session(data_key, new_table.to_frame())
+                st.success(f"✅ {updated} linhas atualizadas e {inserted} inseridas!")
                 st.rerun()
\ No newline at end of file
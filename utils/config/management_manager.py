@@ -1,6 +1,10 @@
+import pandas as pd
 import streamlit as st
 from utils.core.session_manager import SessionManager  # ✅ CORRETO
 from utils.components import UIComponents  # ✅ CORRETO
+from utils.import_helpers import get_dataset_store
+from utils.core.cache import CACHES
+from utils.core.dtypes import savings_report
 
 class ManagementManager:
     """Gerencia operações de manutenção do sistema"""
@@ -45,4 +49,84 @@ class ManagementManager:
             SessionManager.restore_category('vendas')
             SessionManager.restore_category('leads')
             st.success("✅ Todos os dados restaurados!")
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+        
+        ManagementManager._render_memory_report()
+        ManagementManager._render_cache_report()
+    
+    @staticmethod
+    def _format_bytes(num_bytes: int) -> str:
+        for unit in ["B", "KB", "MB"]:
+            if num_bytes < 1024:
+                return f"{num_bytes:,.1f} {unit}"
+            num_bytes /= 1024
+        return f"{num_bytes:,.1f} GB"
+    
+    @staticmethod
+    def _render_memory_report():
+        st.markdown("---")
+        st.markdown("### 💾 Memória dos Dados")
+        
+        usage = get_dataset_store().memory_usage()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Alterações desta sessão", ManagementManager._format_bytes(usage['total_sessao']))
+        with col2:
+            st.metric("Base compartilhada (processo)", ManagementManager._format_bytes(usage['total_compartilhado']))
+        
+        if usage['sessao']:
+            st.dataframe(
+                pd.DataFrame(
+                    [{"tabela": key, "memória": ManagementManager._format_bytes(nbytes)} for key, nbytes in usage['sessao'].items()]
+                ),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.caption("Nenhuma tabela alterada nesta sessão: todos os dados vêm da base compartilhada.")
+        
+        store = get_dataset_store()
+        report = savings_report({key: store.get_table(key) for key in store.keys()})
+        if not report.empty:
+            st.markdown("**Otimização de tipos**")
+            st.caption(
+                f"Economia total: {ManagementManager._format_bytes(int(report['economia'].sum()))} "
+                "(categorias e inteiros/decimais reduzidos conforme o schema de cada tabela)"
+            )
+            for col in ['antes', 'depois', 'economia']:
+                report[col] = report[col].map(ManagementManager._format_bytes)
+            st.dataframe(report, use_container_width=True, hide_index=True)
+    
+    @staticmethod
+    def _render_cache_report():
+        st.markdown("---")
+        st.markdown("### ⚡ Caches")
+        
+        for name, cache in CACHES.items():
+            stats = cache.stats()
+            st.markdown(f"#### {name.capitalize()}")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Entradas", f"{stats['entradas']:,}")
+            with col2:
+                st.metric(
+                    "Memória",
+                    ManagementManager._format_bytes(stats['bytes']),
+                    help=f"Limite: {ManagementManager._format_bytes(stats['limite_bytes'])}"
+                )
+            with col3:
+                st.metric("Hits / Misses", f"{stats['hits']:,} / {stats['misses']:,}")
+            with col4:
+                st.metric("Taxa de acerto", f"{stats['hit_rate']:.1f}%")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                enabled = st.toggle("Usar cache", value=cache.enabled, key=f"cache_enabled_{name}")
+                if enabled != cache.enabled:
+                    cache.enabled = enabled
+                    cache.clear()
+            with col2:
+                if st.button("🧹 Limpar cache", key=f"cache_clear_{name}", use_container_width=True):
+                    cache.clear()
+                    cache.reset_stats()
+                    st.rerun()
@@ -1,5 +1,18 @@
 
-from .session_manager import SessionManager
-from .validation import DataValidator
+import importlib
 
-__all__ = ['SessionManager', 'DataValidator']
\ No newline at end of file
+# Importação sob demanda: SessionManager depende de Streamlit, DataValidator não
+_EXPORTS = {
+    'SessionManager': '.session_manager',
+    'DataValidator': '.validation'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,270 @@
+"""
+Caches em memória do processo (LRU com orçamento de bytes).
+
+As chaves são montadas a partir do fingerprint de conteúdo dos DataFrames
+de entrada (ver utils.core.fingerprint), portanto o cache é seguro entre
+reruns e entre sessões: dados alterados geram chaves novas.
+"""
+
+import functools
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.core.fingerprint import fingerprint_frame
+
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+CACHES: Dict[str, 'LRUCache'] = {}
+
+
+class LRUCache:
+    """Cache LRU limitado por número de entradas e por bytes"""
+
+    def __init__(self, name: str, max_bytes: int, max_entries: int = 512,
+                 sizeof: Callable[[Any], int] = None, enabled: bool = True):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sizeof = sizeof or (lambda value: 0)
+        self.enabled = enabled
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._bypass = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        CACHES[name] = self
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and not getattr(self._bypass, 'depth', 0)
+
+    @contextmanager
+    def bypass(self):
+        """Ignora o cache na thread atual (depuração)"""
+        self._bypass.depth = getattr(self._bypass, 'depth', 0) + 1
+        try:
+            yield
+        finally:
+            self._bypass.depth -= 1
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'nome': self.name,
+                'ativo': self.enabled,
+                'entradas': len(self._entries),
+                'bytes': self._bytes,
+                'limite_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups * 100) if lookups else 0
+            }
+
+
+def cache_key_part(value: Any) -> Hashable:
+    """Converte um argumento em parte de chave (DataFrames pelo fingerprint)"""
+    if isinstance(value, pd.DataFrame):
+        return ('df', fingerprint_frame(value))
+    if isinstance(value, pd.Series):
+        return ('series', value.name, fingerprint_frame(value.to_frame()))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((str(k), cache_key_part(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(cache_key_part(v) for v in value))
+    if isinstance(value, Hashable):
+        return (type(value).__name__, value)
+    return (type(value).__name__, repr(value))
+
+
+def _estimate_size(value: Any) -> int:
+    """Bytes aproximados de uma estrutura de dados de figura (arrays pelo nbytes, sem serializar)"""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return sum(_estimate_size(item) for item in value.ravel())
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + _estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(item) for item in value)
+    if isinstance(value, (pd.Series, pd.Index)):
+        return _estimate_size(value.to_numpy())
+    return 8
+
+
+def _figure_size(figure: Any) -> int:
+    # Dados crus dos traces e do layout (mesma estrutura do JSON, sem gerar o texto)
+    try:
+        return _estimate_size(figure._data) + _estimate_size(figure._layout)
+    except Exception:
+        return 0
+
+
+FIGURE_CACHE = LRUCache(
+    "figuras",
+    max_bytes=env_int("FIGURE_CACHE_MAX_MB", 64) * 1024 * 1024,
+    max_entries=env_int("FIGURE_CACHE_MAX_ENTRIES", 256),
+    sizeof=_figure_size,
+    enabled=not env_flag("FIGURE_CACHE_DISABLED")
+)
+
+
+class FrozenDict(dict):
+    """Dicionário somente leitura (resultados em cache compartilhados entre sessões)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Resultado em cache é somente leitura; use dict(resultado) para obter uma cópia")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Converte um resultado em estrutura imutável (dicts, tuplas, escalares Python)"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        frozen = value.copy()
+        frozen.flags.writeable = False
+        return frozen
+    return value
+
+
+def _pickled_size(value: Any) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+ANALYTICS_CACHE = LRUCache(
+    "análises",
+    max_bytes=env_int("ANALYTICS_CACHE_MAX_MB", 16) * 1024 * 1024,
+    max_entries=env_int("ANALYTICS_CACHE_MAX_ENTRIES", 512),
+    sizeof=_pickled_size,
+    enabled=not env_flag("ANALYTICS_CACHE_DISABLED")
+)
+
+
+def memoize(cache: LRUCache, prepare: Callable[[Any], Any] = None):
+    """
+    Decorador que memoiza a função no cache informado, com chave
+    (função, fingerprints das entradas, parâmetros).
+    """
+    def decorator(func):
+        qualname = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cache.active:
+                return func(*args, **kwargs)
+            key = (qualname, cache_key_part(args), cache_key_part(kwargs))
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            if prepare is not None:
+                value = prepare(value)
+            cache.put(key, value)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def cached_figure(func):
+    """
+    Memoiza funções create_* que retornam figuras Plotly. O cache guarda a
+    figura original e cada chamada recebe uma cópia (go.Figure(fig)):
+    update_layout/add_trace em uma página não alteram a figura das demais
+    sessões. A cópia custa bem menos que montar a figura de novo.
+    """
+    cached = memoize(FIGURE_CACHE)(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not FIGURE_CACHE.active:
+            return func(*args, **kwargs)
+        figure = cached(*args, **kwargs)
+        return go.Figure(figure) if isinstance(figure, go.Figure) else figure
+
+    return wrapper
+
+
+def cached_analytics(func):
+    """
+    Memoiza análises que retornam dicts. O resultado é congelado (FrozenDict,
+    listas viram tuplas) para poder ser compartilhado entre sessões.
+    """
+    return memoize(ANALYTICS_CACHE, prepare=freeze)(func)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Estatísticas de todos os caches do processo"""
+    return {name: cache.stats() for name, cache in CACHES.items()}
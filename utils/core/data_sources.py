@@ -0,0 +1,189 @@
+"""
+Fontes de dados plugáveis para os datasets dados_*.
+
+- MemoryDataSource: dados padrão em memória (DATA_MAPPINGS)
+- FactDataSource: tabelas fato (eventos) em memória, agregadas de forma vetorizada
+- SQLDataSource: banco relacional (PostgreSQL, ou SQLite em desenvolvimento)
+  com as agregações GROUP BY executadas no próprio banco sobre as tabelas
+  fato sales_facts / lead_facts
+"""
+
+import logging
+import os
+import threading
+import pandas as pd
+from typing import Dict, List, Any, Optional, Iterable
+from sqlalchemy import create_engine, select, func, case, cast, Integer, table, column
+from sqlalchemy.engine import Engine
+
+from utils.core.facts import FACT_SCHEMAS, FACT_AGGREGATIONS, DERIVED_KEYS, FactAggregator, finalize_aggregation
+
+logger = logging.getLogger(__name__)
+
+_ENGINES: Dict[str, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(url: str) -> Engine:
+    """Retorna o engine (com pool de conexões) do processo para a URL"""
+    engine = _ENGINES.get(url)
+    if engine is not None:
+        return engine
+    with _ENGINES_LOCK:
+        if url not in _ENGINES:
+            options: Dict[str, Any] = {"pool_pre_ping": True}
+            if not url.startswith("sqlite"):
+                options.update(pool_size=5, max_overflow=10, pool_recycle=1800)
+            _ENGINES[url] = create_engine(url, **options)
+        return _ENGINES[url]
+
+
+def dispose_engines() -> None:
+    """Fecha todos os pools de conexão do processo"""
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+class DataSource:
+    """Interface comum das fontes de dados"""
+
+    def load(self, data_key: str) -> Optional[pd.DataFrame]:
+        """Carrega um dataset dados_* (None se a fonte não o fornece)"""
+        raise NotImplementedError
+
+    def load_many(self, data_keys: Iterable[str]) -> Dict[str, Optional[pd.DataFrame]]:
+        """Carrega vários datasets"""
+        return {data_key: self.load(data_key) for data_key in data_keys}
+
+
+class MemoryDataSource(DataSource):
+    """Fonte com dados em memória (listas de registros ou DataFrames)"""
+
+    def __init__(self, tables: Dict[str, Any]):
+        self.tables = tables
+
+    def load(self, data_key: str) -> Optional[pd.DataFrame]:
+        if data_key not in self.tables:
+            return None
+        data = self.tables[data_key]
+        return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+
+class FactDataSource(DataSource):
+    """Fonte que deriva os datasets a partir de tabelas fato em memória"""
+
+    def __init__(self, sales_facts: pd.DataFrame = None, lead_facts: pd.DataFrame = None):
+        self.aggregator = FactAggregator(sales_facts, lead_facts)
+
+    def load(self, data_key: str) -> Optional[pd.DataFrame]:
+        return self.aggregator.aggregate(data_key)
+
+
+class SQLDataSource(DataSource):
+    """Fonte SQL com agregações executadas no banco"""
+
+    def __init__(self, url: str, schema: str = None, table_names: Dict[str, str] = None):
+        self.url = url
+        self.engine = get_engine(url)
+        self.schema = schema
+        self.table_names = {name: name for name in FACT_SCHEMAS}
+        self.table_names.update(table_names or {})
+
+    def _fact_table(self, fact: str):
+        return table(self.table_names[fact], *[column(col) for col in FACT_SCHEMAS[fact]], schema=self.schema)
+
+    def _derived_expression(self, fact_table, key: str):
+        """Expressão SQL para chaves derivadas (mês, dia da semana, faixas)"""
+        if key not in DERIVED_KEYS:
+            return fact_table.c[key]
+
+        source, kind, bins = DERIVED_KEYS[key]
+        col = fact_table.c[source]
+        dialect = self.engine.dialect.name
+
+        if kind == 'month':
+            if dialect == 'sqlite':
+                return cast(func.strftime('%Y%m', col), Integer)
+            return cast(func.extract('year', col) * 100 + func.extract('month', col), Integer)
+
+        if kind == 'weekday':
+            if dialect == 'sqlite':
+                return cast(func.strftime('%w', col), Integer)
+            return cast(func.extract('dow', col), Integer)
+
+        whens = []
+        for lower, upper, label, _ in bins:
+            condition = col >= lower if upper is None else (col >= lower) & (col < upper)
+            whens.append((condition, label))
+        return case(*whens, else_=None)
+
+    def _measure_expression(self, fact_table, function: str, col_name: str):
+        col = fact_table.c[col_name]
+        if function == 'count':
+            return func.count(col)
+        if function == 'count_distinct':
+            return func.count(col.distinct())
+        if function == 'sum':
+            return func.coalesce(func.sum(col), 0)
+        if function == 'max':
+            return func.max(col)
+        raise ValueError(f"Função de agregação não suportada: {function}")
+
+    def build_query(self, fact: str, keys: List[str], measures: Dict[str, Any]):
+        """Monta o SELECT ... GROUP BY de uma agregação"""
+        fact_table = self._fact_table(fact)
+        key_columns = [self._derived_expression(fact_table, key).label(key) for key in keys]
+        measure_columns = [
+            self._measure_expression(fact_table, function, col_name).label(name)
+            for name, (function, col_name) in measures.items()
+        ]
+        # Agrupa pelo alias para que o GROUP BY não repita expressões com parâmetros
+        return select(*key_columns, *measure_columns).group_by(*[column(key) for key in keys])
+
+    def _load_with_connection(self, connection, data_key: str) -> Optional[pd.DataFrame]:
+        if data_key not in FACT_AGGREGATIONS:
+            return None
+        parts = [
+            pd.read_sql(self.build_query(fact, keys, measures), connection)
+            for fact, keys, measures in FACT_AGGREGATIONS[data_key]
+        ]
+        return finalize_aggregation(data_key, parts)
+
+    def load(self, data_key: str) -> Optional[pd.DataFrame]:
+        with self.engine.connect() as connection:
+            return self._load_with_connection(connection, data_key)
+
+    def load_many(self, data_keys: Iterable[str]) -> Dict[str, Optional[pd.DataFrame]]:
+        with self.engine.connect() as connection:
+            return {data_key: self._load_with_connection(connection, data_key) for data_key in data_keys}
+
+
+def get_configured_source() -> Optional[DataSource]:
+    """
+    Retorna a fonte SQL configurada por DATABASE_URL (variável de ambiente
+    ou arquivo .env); None quando não houver banco configurado
+    """
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        return None
+    return SQLDataSource(url, schema=os.environ.get("DATABASE_SCHEMA") or None)
+
+
+def load_with_fallback(source: Optional[DataSource], data_key: str, default_data: Any) -> Any:
+    """Carrega da fonte, usando os dados padrão se a fonte falhar ou não fornecer a tabela"""
+    if source is None:
+        return default_data
+    try:
+        data = source.load(data_key)
+    except Exception as e:
+        logger.warning("Falha ao carregar %s da fonte de dados: %s", data_key, e)
+        return default_data
+    return default_data if data is None else data
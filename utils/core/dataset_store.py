@@ -0,0 +1,551 @@
+"""
+Armazenamento colunar e versionado dos datasets dados_*
+"""
+
+import itertools
+import threading
+import uuid
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.core.dtypes import get_dtype_schema, optimize_frame
+from utils.core.fingerprint import fingerprint_columns, register_view
+
+_VERSION_COUNTER = itertools.count(1)
+_VERSION_LOCK = threading.Lock()
+
+
+def next_version() -> int:
+    """Retorna a próxima versão global (monotonicamente crescente no processo)"""
+    with _VERSION_LOCK:
+        return next(_VERSION_COUNTER)
+
+
+def _freeze_column(series: pd.Series, copy: bool = True) -> Any:
+    """
+    Converte uma coluna em array tipado somente leitura. copy=False apenas
+    para colunas recém-montadas que não são referenciadas em outro lugar.
+    """
+    if isinstance(series.dtype, np.dtype):
+        values = series.to_numpy(copy=copy)
+        values.flags.writeable = False
+        return values
+    # Tipos de extensão (categorical, string, nullable) mantêm o próprio array
+    return series.array.copy() if copy else series.array
+
+
+def _missing_column(dtype: Any, length: int) -> pd.Series:
+    """Coluna nula para um bloco sem a coluna (bool numpy vira object, int vira float, como no pd.concat)"""
+    if isinstance(dtype, np.dtype) and dtype.kind == 'b':
+        dtype = object
+    return pd.Series(index=range(length), dtype=dtype)
+
+
+def _cast_lossless(incoming: pd.Series, dtype: np.dtype) -> Optional[pd.Series]:
+    """Valores numéricos convertidos ao tipo da coluna atual, se não houver perda"""
+    if not isinstance(incoming.dtype, np.dtype) or incoming.dtype.kind not in 'iuf' or dtype.kind not in 'iuf':
+        return None
+    values = incoming.to_numpy()
+    if dtype.kind in 'iu' and values.dtype.kind == 'f' and np.isnan(values).any():
+        return None
+    with np.errstate(invalid='ignore', over='ignore'):
+        cast = values.astype(dtype)
+        if not np.array_equal(cast.astype(values.dtype), values, equal_nan=values.dtype.kind == 'f'):
+            return None
+    return pd.Series(cast, name=incoming.name)
+
+
+def _align_column(current: pd.Series, incoming: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Ajusta os valores novos ao tipo da coluna atual quando possível, para
+    que a coluna mantenha o tipo otimizado: categóricas recebem apenas as
+    categorias novas (sem recodificar as linhas existentes) e numéricas
+    recebem a conversão sem perda (ex.: int64 -> int32).
+    """
+    if isinstance(current.dtype, pd.CategoricalDtype) and not isinstance(incoming.dtype, pd.CategoricalDtype):
+        new_categories = pd.Index(incoming.dropna().unique()).difference(current.cat.categories)
+        try:
+            categories = current.cat.categories.append(new_categories) if len(new_categories) else current.cat.categories
+            encoded = pd.Categorical(incoming, categories=categories)
+        except (TypeError, ValueError):
+            encoded = None
+        # Valores que não couberam nas categorias (tipos diferentes): concatenação comum
+        if encoded is not None and encoded.isna().sum() == incoming.isna().sum():
+            if len(new_categories):
+                current = current.cat.set_categories(categories)
+            incoming = pd.Series(encoded, name=incoming.name)
+    elif isinstance(current.dtype, np.dtype) and current.dtype != incoming.dtype:
+        cast = _cast_lossless(incoming, current.dtype)
+        if cast is not None:
+            incoming = cast
+    return current, incoming
+
+
+def _combine_column(current: pd.Series, incoming: pd.Series) -> pd.Series:
+    """Concatena a coluna atual com valores novos, preservando o tipo da coluna atual"""
+    current, incoming = _align_column(current, incoming)
+    return pd.concat([current, incoming], ignore_index=True)
+
+
+def _upsert_column(current: pd.Series, incoming: pd.Series, positions: np.ndarray,
+                   update_rows: np.ndarray, insert_rows: np.ndarray) -> pd.Series:
+    """
+    Coluna após o upsert: cópia da coluna atual com as posições atualizadas
+    escritas no lugar (O(k) após a cópia do buffer) e as linhas inseridas
+    ao final. Tipos incompatíveis caem na concatenação + reordenação.
+    """
+    current, incoming = _align_column(current, incoming)
+    if current.dtype == incoming.dtype:
+        try:
+            updated = current.copy()
+            if len(update_rows):
+                updated.iloc[positions] = incoming.iloc[update_rows].to_numpy()
+            if not len(insert_rows):
+                return updated
+            return pd.concat([updated, incoming.iloc[insert_rows]], ignore_index=True)
+        except (TypeError, ValueError):
+            pass
+    rows = len(current)
+    order = np.arange(rows + len(insert_rows))
+    order[positions] = rows + update_rows
+    order[rows:] = rows + insert_rows
+    return pd.concat([current, incoming], ignore_index=True).take(order).reset_index(drop=True)
+
+
+def _row_keys(columns: Any, key_columns: List[str]) -> List[Any]:
+    """Chaves das linhas (valor único ou tupla para chaves compostas)"""
+    values = [pd.Series(columns[col], copy=False).tolist() for col in key_columns]
+    if len(values) == 1:
+        return values[0]
+    return list(zip(*values))
+
+
+class KeyIndex(Mapping):
+    """
+    Índice chave -> posição compartilhado entre versões: um dicionário base
+    (imutável depois de criado) e o delta das chaves adicionadas desde então.
+    Estender o índice copia apenas o delta; quando o delta passa de 1/4 da
+    base, os dois são fundidos (custo amortizado proporcional às chaves novas).
+    """
+
+    def __init__(self, base: Dict[Any, int], delta: Dict[Any, int] = None):
+        self._base = base
+        self._delta = delta or {}
+        self._size = len(base) + sum(1 for key in self._delta if key not in base)
+
+    def __getitem__(self, key: Any) -> int:
+        if key in self._delta:
+            return self._delta[key]
+        return self._base[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._delta.get(key, default)
+        return value if key in self._delta else self._base.get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._delta or key in self._base
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._base
+        yield from (key for key in self._delta if key not in self._base)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extended(self, items: Iterable[Tuple[Any, int]]) -> 'KeyIndex':
+        """Novo índice com as chaves informadas (a última ocorrência vence)"""
+        delta = dict(self._delta)
+        delta.update(items)
+        if len(delta) > len(self._base) // 4:
+            return KeyIndex({**self._base, **delta})
+        return KeyIndex(self._base, delta)
+
+
+class ColumnarTable:
+    """Tabela imutável armazenada como colunas tipadas com versão"""
+
+    def __init__(self, columns: Dict[str, Any], version: int, parent_version: int = None, append_start: int = None):
+        self.columns = columns
+        self.version = version
+        # Linhagem: quando a tabela é a versão anterior + linhas novas,
+        # as linhas [append_start:] são as únicas que mudaram
+        self.parent_version = parent_version
+        self.append_start = append_start
+        self._frame: Optional[pd.DataFrame] = None
+        self._nbytes: Optional[int] = None
+        self._fingerprint: Optional[str] = None
+        # Bytes (antes, depois) por coluna convertida pelo schema de tipos
+        self.dtype_savings: Dict[str, Tuple[int, int]] = {}
+        self._dtypes_applied: Optional[Dict[str, str]] = None
+        # Índices hash chave primária -> posição da linha, por conjunto de colunas
+        self._key_indexes: Dict[Tuple[str, ...], KeyIndex] = {}
+
+    @classmethod
+    def from_data(cls, data: Any, version: int = None, dtypes: Dict[str, str] = None) -> 'ColumnarTable':
+        """Cria tabela a partir de DataFrame ou lista de registros, aplicando o schema de tipos"""
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        savings = {}
+        if dtypes:
+            frame, savings = optimize_frame(frame, dtypes)
+        columns = {col: _freeze_column(frame[col]) for col in frame.columns}
+        table = cls(columns, version if version is not None else next_version())
+        table.dtype_savings = savings
+        table._dtypes_applied = dtypes or None
+        return table
+
+    @classmethod
+    def from_chunks(cls, chunks: List[pd.DataFrame], version: int = None) -> 'ColumnarTable':
+        """
+        Cria tabela concatenando blocos coluna a coluna. Cada coluna é
+        removida dos blocos logo após ser copiada, limitando o pico de memória.
+        As colunas são a união (em ordem de aparição) das colunas dos blocos
+        (ex.: JSON lines com chaves diferentes por bloco); blocos sem uma
+        coluna recebem valores nulos, como no pd.concat dos DataFrames.
+        """
+        if not chunks:
+            return cls.from_data(pd.DataFrame(), version)
+        columns = {}
+        for name in dict.fromkeys(col for chunk in chunks for col in chunk.columns):
+            dtype = next(chunk[name].dtype for chunk in chunks if name in chunk.columns)
+            column = pd.concat(
+                [chunk.pop(name) if name in chunk.columns else _missing_column(dtype, len(chunk)) for chunk in chunks],
+                ignore_index=True
+            )
+            columns[name] = _freeze_column(column)
+        return cls(columns, version if version is not None else next_version())
+
+    def __len__(self) -> int:
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns.keys())
+
+    def appended(self, data: Any, dtypes: Dict[str, str] = None) -> 'ColumnarTable':
+        """Nova versão com as linhas adicionadas ao final (registra a linhagem)"""
+        new_rows = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        table = self._derived(self._combined(new_rows), dtypes)
+        table.parent_version = self.version
+        table.append_start = len(self)
+        # Índices já construídos seguem para a nova versão (última ocorrência vence)
+        for key_columns, index in self._key_indexes.items():
+            if all(col in new_rows.columns for col in key_columns):
+                table._key_indexes[key_columns] = index.extended(
+                    zip(_row_keys(new_rows, list(key_columns)), range(len(self), len(table)))
+                )
+        return table
+
+    def key_index(self, key_columns: List[str]) -> KeyIndex:
+        """
+        Índice hash chave -> posição da linha (construído uma vez por versão).
+        Com chaves repetidas na tabela, aponta para a última ocorrência.
+        """
+        key = tuple(key_columns)
+        index = self._key_indexes.get(key)
+        if index is None:
+            missing = [col for col in key_columns if col not in self.columns]
+            if missing and len(self):
+                raise ValueError(f"Colunas da chave primária ausentes na tabela: {', '.join(missing)}")
+            index = KeyIndex(dict(zip(_row_keys(self.columns, key_columns), range(len(self)))) if not missing else {})
+            self._key_indexes[key] = index
+        return index
+
+    def _match_keys(self, data: Any, key_columns: List[str]) -> Tuple[pd.DataFrame, List[Any], np.ndarray]:
+        """Linhas novas (sem chaves repetidas), suas chaves e a posição atual de cada uma (-1 se nova)"""
+        new_rows = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        missing = [col for col in key_columns if col not in new_rows.columns]
+        if missing:
+            raise ValueError(f"Colunas da chave primária ausentes: {', '.join(missing)}")
+        # Chave repetida no lote: a última linha vence
+        new_rows = new_rows.drop_duplicates(subset=key_columns, keep='last').reset_index(drop=True)
+        index = self.key_index(key_columns)
+        keys = _row_keys(new_rows, key_columns)
+        positions = np.fromiter((index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+        return new_rows, keys, positions
+
+    def upsert_counts(self, data: Any, key_columns: List[str]) -> Tuple[int, int]:
+        """Simula o upsert: (inseridas, atualizadas)"""
+        _, _, positions = self._match_keys(data, list(key_columns))
+        updated = int((positions >= 0).sum())
+        return len(positions) - updated, updated
+
+    def upserted(self, data: Any, key_columns: List[str], dtypes: Dict[str, str] = None) -> Tuple['ColumnarTable', int, int]:
+        """
+        Nova versão em que as linhas com chave existente são atualizadas no
+        lugar e as demais são inseridas ao final. As chaves são localizadas
+        pelo índice hash da versão atual, que é estendido para a nova versão.
+        Retorna (tabela, inseridas, atualizadas).
+        """
+        key_columns = list(key_columns)
+        new_rows, keys, positions = self._match_keys(data, key_columns)
+        index = self.key_index(key_columns)
+        is_update = positions >= 0
+        inserted_rows = np.flatnonzero(~is_update)
+
+        # Coluna a coluna: cópia do buffer atual + escrita das k posições atualizadas + inseridas ao final
+        rows = len(self)
+        update_rows = np.flatnonzero(is_update)
+        columns = {}
+        for col, current, incoming in self._aligned(new_rows):
+            columns[col] = _upsert_column(current, incoming, positions[is_update], update_rows, inserted_rows)
+        table = self._derived(pd.DataFrame(columns, copy=False), dtypes)
+
+        table._key_indexes[tuple(key_columns)] = index.extended(
+            zip((keys[i] for i in inserted_rows), range(rows, len(table)))
+        )
+        if not is_update.any():
+            table.parent_version = self.version
+            table.append_start = rows
+        return table, len(inserted_rows), int(is_update.sum())
+
+    def with_dtypes(self, dtypes: Dict[str, str]) -> 'ColumnarTable':
+        """Tabela com o schema de tipos aplicado (a própria tabela se já estiver otimizada)"""
+        if not dtypes or self._dtypes_applied == dtypes:
+            return self
+        optimized, savings = optimize_frame(self._base_frame(), dtypes)
+        if not savings:
+            # Nada a converter; a tabela (imutável) não é marcada como otimizada
+            return self
+        table = ColumnarTable.from_data(optimized)
+        table._dtypes_applied = dtypes
+        table.parent_version = self.parent_version
+        table.append_start = self.append_start
+        table.dtype_savings = {**self.dtype_savings, **savings}
+        table._key_indexes = self._key_indexes
+        return table
+
+    def _base_frame(self) -> pd.DataFrame:
+        """DataFrame interno sobre as colunas (uso interno, não registrado como visão)"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.columns, copy=False)
+        return self._frame
+
+    def _aligned(self, new_rows: pd.DataFrame):
+        """(coluna, valores atuais, valores novos) para a união das colunas"""
+        frame = self._base_frame()
+        incoming = new_rows.reindex(columns=frame.columns.union(new_rows.columns, sort=False))
+        for col in incoming.columns:
+            current = frame[col] if col in frame.columns else pd.Series(np.nan, index=frame.index)
+            yield col, current, incoming[col].reset_index(drop=True)
+
+    def _combined(self, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """Linhas atuais seguidas das novas, coluna a coluna"""
+        if not self.columns:
+            return new_rows.reset_index(drop=True).copy()
+        return pd.DataFrame({
+            col: _combine_column(current, incoming) for col, current, incoming in self._aligned(new_rows)
+        }, copy=False)
+
+    def _derived(self, frame: pd.DataFrame, dtypes: Dict[str, str] = None) -> 'ColumnarTable':
+        """
+        Nova tabela a partir de colunas recém-montadas (sem nova cópia). Se
+        esta tabela já tem o schema aplicado, só as colunas cujo tipo mudou
+        (ou novas) passam pela otimização; as demais mantêm o tipo atual.
+        """
+        if dtypes and self._dtypes_applied == dtypes and self.columns:
+            pending = {
+                col: kind for col, kind in dtypes.items()
+                if col in frame.columns and (col not in self.columns or frame[col].dtype != self._base_frame()[col].dtype)
+            }
+        else:
+            pending = dtypes or {}
+        savings = {}
+        if pending:
+            frame, savings = optimize_frame(frame, pending)
+        table = ColumnarTable({col: _freeze_column(frame[col], copy=False) for col in frame.columns}, next_version())
+        table.dtype_savings = {**self.dtype_savings, **savings} if dtypes else savings
+        table._dtypes_applied = dtypes or None
+        return table
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Retorna uma visão DataFrame somente leitura, sem reconstruir os dados.
+        A visão é uma cópia rasa: novas colunas adicionadas pelo chamador não
+        afetam a tabela armazenada.
+        """
+        view = self._base_frame().copy(deep=False)
+        register_view(view, self.fingerprint)
+        return view
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash do conteúdo (calculado uma vez; a tabela é imutável)"""
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint_columns(self.columns, pd.RangeIndex(len(self)))
+        return self._fingerprint
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelas colunas (inclui conteúdo de strings)"""
+        if self._nbytes is None:
+            frame = self._base_frame()
+            self._nbytes = int(frame.memory_usage(index=False, deep=True).sum()) if len(frame.columns) else 0
+        return self._nbytes
+
+
+def _prepare_table(data_key: str, data: Any) -> ColumnarTable:
+    """Converte os dados em tabela colunar com o schema de tipos da tabela aplicado"""
+    dtypes = get_dtype_schema(data_key)
+    if isinstance(data, ColumnarTable):
+        return data.with_dtypes(dtypes)
+    return ColumnarTable.from_data(data, dtypes=dtypes)
+
+
+class SharedDatasets:
+    """
+    Registro de datasets base imutáveis, compartilhado por todas as sessões
+    do processo. Cada tabela é carregada uma única vez.
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, ColumnarTable] = {}
+        self._lock = threading.Lock()
+        # Identifica esta carga das tabelas base (novo a cada processo): o
+        # manifesto da ingestão por pasta reaplica os arquivos quando muda
+        self.base_id = uuid.uuid4().hex
+
+    def __contains__(self, data_key: str) -> bool:
+        return data_key in self._tables
+
+    def keys(self) -> List[str]:
+        return list(self._tables.keys())
+
+    def get(self, data_key: str) -> Optional[ColumnarTable]:
+        return self._tables.get(data_key)
+
+    def register(self, data_key: str, data: Any) -> ColumnarTable:
+        """Registra a tabela base caso ainda não exista e retorna a versão vigente"""
+        table = self._tables.get(data_key)
+        if table is not None:
+            return table
+        with self._lock:
+            if data_key not in self._tables:
+                self._tables[data_key] = _prepare_table(data_key, data)
+            return self._tables[data_key]
+
+    def replace(self, data_key: str, data: Any) -> ColumnarTable:
+        """Substitui a tabela base (ex.: recarga a partir da fonte de dados)"""
+        table = _prepare_table(data_key, data)
+        with self._lock:
+            self._tables[data_key] = table
+        return table
+
+    def upsert(self, data_key: str, data: Any, key_columns: List[str]) -> Tuple[int, int]:
+        """Atualiza/insere linhas da tabela base pela chave primária e retorna (inseridas, atualizadas)"""
+        with self._lock:
+            current = self._tables.get(data_key)
+            if current is None:
+                current = ColumnarTable({}, 0)
+            table, inserted, updated = current.upserted(data, key_columns, dtypes=get_dtype_schema(data_key))
+            self._tables[data_key] = _prepare_table(data_key, table)
+            return inserted, updated
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Memória por tabela base, em bytes"""
+        return {key: table.nbytes for key, table in self._tables.items()}
+
+
+SHARED_DATASETS = SharedDatasets()
+
+
+class DatasetStore:
+    """
+    Datasets dados_* de uma sessão. As leituras combinam as tabelas base
+    compartilhadas com o overlay da sessão (copy-on-write): apenas tabelas
+    editadas, importadas ou limpas na sessão ocupam memória própria.
+    """
+
+    def __init__(self, base: SharedDatasets = None):
+        self._base = base if base is not None else SHARED_DATASETS
+        self._overlay: Dict[str, ColumnarTable] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, data_key: str) -> bool:
+        return data_key in self._overlay or data_key in self._base
+
+    @property
+    def base(self) -> SharedDatasets:
+        return self._base
+
+    def keys(self) -> List[str]:
+        keys = self._base.keys()
+        return keys + [key for key in self._overlay if key not in keys]
+
+    def get_table(self, data_key: str) -> Optional[ColumnarTable]:
+        """Retorna a tabela atual da sessão (overlay ou base) ou None"""
+        table = self._overlay.get(data_key)
+        if table is None:
+            table = self._base.get(data_key)
+        return table
+
+    def get_frame(self, data_key: str, default_columns: List[str] = None) -> pd.DataFrame:
+        """Retorna visão DataFrame da tabela ou um DataFrame vazio"""
+        table = self.get_table(data_key)
+        if table is None:
+            return pd.DataFrame(columns=default_columns or [])
+        return table.to_frame()
+
+    def put(self, data_key: str, data: Any) -> int:
+        """Grava a tabela no overlay da sessão e retorna a nova versão"""
+        table = _prepare_table(data_key, data)
+        with self._lock:
+            self._overlay[data_key] = table
+        return table.version
+
+    def append(self, data_key: str, data: Any) -> int:
+        """Adiciona linhas ao final da tabela e retorna a nova versão"""
+        with self._lock:
+            current = self.get_table(data_key)
+            if current is None:
+                return self.put(data_key, data)
+            return self.put(data_key, current.appended(data, dtypes=get_dtype_schema(data_key)))
+
+    def upsert(self, data_key: str, data: Any, key_columns: List[str]) -> Tuple[int, int]:
+        """Atualiza/insere linhas pela chave primária e retorna (inseridas, atualizadas)"""
+        with self._lock:
+            current = self.get_table(data_key)
+            if current is None:
+                current = ColumnarTable({}, 0)
+            table, inserted, updated = current.upserted(data, key_columns, dtypes=get_dtype_schema(data_key))
+            self.put(data_key, table)
+            return inserted, updated
+
+    def upsert_counts(self, data_key: str, data: Any, key_columns: List[str]) -> Tuple[int, int]:
+        """Quantas linhas seriam (inseridas, atualizadas) pelo upsert, sem gravar"""
+        current = self.get_table(data_key)
+        if current is None:
+            current = ColumnarTable({}, 0)
+        return current.upsert_counts(data, key_columns)
+
+    def delete(self, data_key: str) -> None:
+        """Descarta as alterações da sessão, voltando à tabela base (se houver)"""
+        with self._lock:
+            self._overlay.pop(data_key, None)
+
+    def is_modified(self, data_key: str) -> bool:
+        """Indica se a sessão possui cópia própria da tabela"""
+        return data_key in self._overlay
+
+    def version(self, data_key: str) -> int:
+        """Retorna a versão atual da tabela (0 se não existir)"""
+        table = self.get_table(data_key)
+        return table.version if table is not None else 0
+
+    def fingerprint(self, data_key: str) -> str:
+        """Fingerprint do conteúdo atual da tabela ('' se não existir)"""
+        table = self.get_table(data_key)
+        return table.fingerprint if table is not None else ''
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Relatório de memória: overlay da sessão vs. base compartilhada"""
+        overlay = {key: table.nbytes for key, table in self._overlay.items()}
+        shared = self._base.memory_usage()
+        return {
+            'sessao': overlay,
+            'total_sessao': sum(overlay.values()),
+            'total_compartilhado': sum(shared.values())
+        }
@@ -0,0 +1,118 @@
+"""
+Otimização de tipos guiada pelo schema das tabelas (DataValidator).
+
+- "category": texto com baixa cardinalidade vira Categorical
+- "integer": inteiros (ou floats integrais sem nulos) são reduzidos até int32
+- "float": float64 vira float32 apenas quando a conversão não perde precisão
+
+Conversões só são aplicadas quando reduzem a memória e preservam os valores.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+# Proporção máxima de valores distintos para codificar texto como categoria
+CATEGORY_MAX_RATIO = 0.5
+
+
+def get_dtype_schema(data_key: str) -> Dict[str, str]:
+    """Tipos alvo da tabela (vazio se não houver schema)"""
+    from utils.core.validation import DataValidator
+
+    return DataValidator.get_validation_info(data_key).get("dtypes", {})
+
+
+def _to_category(series: pd.Series) -> Optional[pd.Series]:
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_numeric_dtype(series.dtype):
+        return None
+    if len(series) == 0 or series.nunique(dropna=True) > len(series) * CATEGORY_MAX_RATIO:
+        return None
+    return series.astype('category')
+
+
+def _to_integer(series: pd.Series) -> Optional[pd.Series]:
+    if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in 'iuf':
+        return None
+    if series.dtype.kind in 'iu' and series.dtype.itemsize <= 4:
+        return None
+    values = series.to_numpy()
+    if series.dtype.kind == 'f':
+        if np.isnan(values).any() or not np.array_equal(values, np.floor(values)):
+            return None
+    if len(values) == 0:
+        return None
+    low, high = values.min(), values.max()
+    info = np.iinfo(np.int32)
+    if low < info.min or high > info.max:
+        return None
+    return series.astype(np.int32)
+
+
+def _to_float(series: pd.Series) -> Optional[pd.Series]:
+    if series.dtype != np.float64:
+        return None
+    values = series.to_numpy()
+    downcast = values.astype(np.float32)
+    if not np.array_equal(downcast.astype(np.float64), values, equal_nan=True):
+        return None
+    return pd.Series(downcast, index=series.index, name=series.name)
+
+
+_CONVERTERS = {
+    'category': _to_category,
+    'integer': _to_integer,
+    'float': _to_float
+}
+
+
+def optimize_frame(frame: pd.DataFrame, schema: Dict[str, str]) -> Tuple[pd.DataFrame, Dict[str, Tuple[int, int]]]:
+    """
+    Aplica o schema de tipos. Retorna o DataFrame (o mesmo objeto se nada
+    mudou) e, por coluna convertida, os bytes (antes, depois).
+    """
+    changes = {}
+    for col, kind in schema.items():
+        if col not in frame.columns or kind not in _CONVERTERS:
+            continue
+        original = frame[col]
+        converted = _CONVERTERS[kind](original)
+        if converted is None:
+            continue
+        before = int(original.memory_usage(index=False, deep=True))
+        after = int(converted.memory_usage(index=False, deep=True))
+        if after < before:
+            changes[col] = (before, after, converted)
+
+    if not changes:
+        return frame, {}
+    optimized = frame.assign(**{col: converted for col, (_, _, converted) in changes.items()})
+    return optimized, {col: (before, after) for col, (before, after, _) in changes.items()}
+
+
+def decode_categories(frame: pd.DataFrame) -> pd.DataFrame:
+    """Converte colunas categóricas de volta ao tipo original (ex.: para edição livre)"""
+    categorical = [col for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return frame
+    return frame.assign(**{
+        col: frame[col].astype(frame[col].cat.categories.dtype) for col in categorical
+    })
+
+
+def savings_report(tables: Dict[str, Any]) -> pd.DataFrame:
+    """Bytes economizados por tabela (tabelas com otimização de tipos)"""
+    rows = []
+    for data_key, table in tables.items():
+        if table is None or not table.dtype_savings:
+            continue
+        before = sum(before for before, _ in table.dtype_savings.values())
+        after = sum(after for _, after in table.dtype_savings.values())
+        rows.append({
+            'tabela': data_key,
+            'colunas': ", ".join(table.dtype_savings.keys()),
+            'antes': before,
+            'depois': after,
+            'economia': before - after
+        })
+    return pd.DataFrame(rows, columns=['tabela', 'colunas', 'antes', 'depois', 'economia'])
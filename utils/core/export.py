@@ -0,0 +1,234 @@
+"""
+Exportação das tabelas do DatasetStore.
+
+Os arquivos são gerados somente quando o download é solicitado (o
+st.download_button recebe uma função) e escritos em blocos de linhas. O
+resultado fica em cache pelo fingerprint do conteúdo: downloads repetidos
+de uma tabela inalterada não serializam os dados novamente.
+
+O pacote "Exportar Tudo" serializa as tabelas em paralelo (pool de
+threads), cada uma em um arquivo temporário que vai para o disco acima de
+SPOOL_MAX_BYTES, e copia os arquivos um a um para o ZIP com um manifesto.
+
+A planilha Excel usa o modo write-only do openpyxl: as linhas são
+convertidas e gravadas em blocos, sem manter a pasta de trabalho em
+memória (uma aba por tabela, células numéricas e de data tipadas).
+"""
+
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, IO, Iterator, List
+
+import pandas as pd
+
+from utils.core.cache import LRUCache, env_flag, env_int
+from utils.core.dataset_store import ColumnarTable
+
+EXPORT_CHUNK_ROWS = 100_000
+EXPORT_THREADS = max(env_int("EXPORT_THREADS", min(4, os.cpu_count() or 1)), 1)
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+# Limite de linhas por aba do Excel (o excedente continua em abas "tabela (2)", ...)
+XLSX_MAX_ROWS = 1_048_576
+# Linhas convertidas para objetos Python de cada vez (a planilha é gravada célula a célula)
+XLSX_CHUNK_ROWS = 10_000
+
+BUNDLE_FORMATS = {
+    'parquet': ('.parquet', zipfile.ZIP_STORED),
+    'csv': ('.csv', zipfile.ZIP_DEFLATED)
+}
+
+# Arquivos maiores que isto são gerados a cada download, sem ocupar o cache
+EXPORT_CACHE_MAX_ITEM_BYTES = env_int("EXPORT_CACHE_MAX_ITEM_MB", 32) * 1024 * 1024
+
+EXPORT_CACHE = LRUCache(
+    "exportações",
+    max_bytes=env_int("EXPORT_CACHE_MAX_MB", 128) * 1024 * 1024,
+    max_entries=env_int("EXPORT_CACHE_MAX_ENTRIES", 64),
+    sizeof=len,
+    enabled=not env_flag("EXPORT_CACHE_DISABLED")
+)
+
+
+def _cached_export(key: Any, write: Callable[[IO[bytes]], Any]) -> bytes:
+    """
+    Gera o arquivo em um temporário (memória até SPOOL_MAX_BYTES, depois
+    disco) lido uma única vez, sem a cópia extra de BytesIO.getvalue().
+    Arquivos acima de EXPORT_CACHE_MAX_ITEM_BYTES não entram no cache.
+    """
+    if EXPORT_CACHE.active:
+        found, data = EXPORT_CACHE.get(key)
+        if found:
+            return data
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spooled:
+        write(spooled)
+        spooled.seek(0)
+        data = spooled.read()
+    if EXPORT_CACHE.active and len(data) <= EXPORT_CACHE_MAX_ITEM_BYTES:
+        EXPORT_CACHE.put(key, data)
+    return data
+
+
+def write_csv(table: ColumnarTable, buffer: IO[bytes], chunk_rows: int = EXPORT_CHUNK_ROWS) -> None:
+    """Escreve a tabela como CSV (UTF-8) no buffer, bloco a bloco"""
+    frame = table.to_frame()
+    if len(frame) == 0:
+        frame.to_csv(buffer, index=False, encoding="utf-8")
+        return
+    for start in range(0, len(frame), chunk_rows):
+        frame.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=start == 0, encoding="utf-8")
+
+
+def table_to_csv(table: ColumnarTable) -> bytes:
+    """CSV da tabela, reaproveitado do cache enquanto o conteúdo não mudar"""
+    return _cached_export(("csv", table.fingerprint), lambda output: write_csv(table, output))
+
+
+def csv_download(table: ColumnarTable) -> Callable[[], bytes]:
+    """
+    Função para o data do st.download_button: o CSV só é gerado no clique
+    (em outra thread). A tabela é imutável, então a função exporta exatamente
+    a versão exibida.
+    """
+    return lambda: table_to_csv(table)
+
+
+def write_parquet(table: ColumnarTable, buffer: IO[bytes], chunk_rows: int = EXPORT_CHUNK_ROWS) -> None:
+    """Escreve a tabela como Parquet, um row group por bloco de linhas"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frame = table.to_frame()
+    schema = pa.Schema.from_pandas(frame.head(0), preserve_index=False)
+    with pq.ParquetWriter(buffer, schema) as writer:
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            block = frame.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(block, schema=schema, preserve_index=False))
+
+
+def _serialize(table: ColumnarTable, file_format: str) -> IO[bytes]:
+    """Serializa a tabela em um arquivo temporário (memória até SPOOL_MAX_BYTES, depois disco)"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    if file_format == 'parquet':
+        write_parquet(table, spooled)
+    else:
+        write_csv(table, spooled)
+    spooled.seek(0)
+    return spooled
+
+
+def _table_manifest(data_key: str, file_name: str, table: ColumnarTable) -> Dict[str, Any]:
+    frame = table.to_frame()
+    return {
+        'tabela': data_key,
+        'arquivo': file_name,
+        'registros': len(table),
+        'colunas': [{'nome': str(col), 'tipo': str(frame[col].dtype)} for col in frame.columns],
+        'fingerprint': table.fingerprint
+    }
+
+
+def write_bundle(tables: Dict[str, ColumnarTable], output: IO[bytes], file_format: str = 'parquet',
+                 workers: int = None) -> Dict[str, Any]:
+    """
+    Escreve todas as tabelas em um ZIP (um arquivo por tabela + manifest.json).
+    As tabelas são serializadas em paralelo; cada arquivo é copiado para o
+    ZIP assim que fica pronto e descartado em seguida.
+    """
+    if file_format not in BUNDLE_FORMATS:
+        raise ValueError(f"Formato de exportação não suportado: {file_format}")
+    extension, compression = BUNDLE_FORMATS[file_format]
+    manifest = {
+        'gerado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'formato': file_format,
+        'tabelas': []
+    }
+    with zipfile.ZipFile(output, 'w', compression=compression) as archive, \
+            ThreadPoolExecutor(max_workers=workers or EXPORT_THREADS, thread_name_prefix="export") as executor:
+        futures = [
+            (data_key, table, executor.submit(_serialize, table, file_format))
+            for data_key, table in tables.items()
+        ]
+        for data_key, table, future in futures:
+            file_name = f"{data_key}{extension}"
+            with future.result() as serialized, archive.open(file_name, 'w', force_zip64=True) as entry:
+                shutil.copyfileobj(serialized, entry, 1024 * 1024)
+            manifest['tabelas'].append(_table_manifest(data_key, file_name, table))
+        archive.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+    return manifest
+
+
+def export_bundle(tables: Dict[str, ColumnarTable], file_format: str = 'parquet') -> bytes:
+    """ZIP com todas as tabelas, reaproveitado do cache enquanto nenhuma tabela mudar"""
+    key = ('bundle', file_format, tuple((data_key, table.fingerprint) for data_key, table in tables.items()))
+    return _cached_export(key, lambda output: write_bundle(tables, output, file_format))
+
+
+def bundle_download(tables: Dict[str, ColumnarTable], file_format: str = 'parquet') -> Callable[[], bytes]:
+    """Função para o data do st.download_button (ZIP gerado apenas no clique)"""
+    return lambda: export_bundle(tables, file_format)
+
+
+def _xlsx_columns(block: pd.DataFrame) -> List[List[Any]]:
+    """Valores das colunas do bloco como objetos Python (nulos viram células vazias)"""
+    columns = []
+    for col in block.columns:
+        series = block[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(series.cat.categories.dtype)
+        values = series.astype(object)
+        columns.append(values.where(series.notna(), None).tolist())
+    return columns
+
+
+def _xlsx_rows(frame: pd.DataFrame, chunk_rows: int) -> Iterator[tuple]:
+    for start in range(0, len(frame), chunk_rows):
+        yield from zip(*_xlsx_columns(frame.iloc[start:start + chunk_rows]))
+
+
+def _sheet_title(data_key: str, part: int) -> str:
+    suffix = f" ({part + 1})" if part else ""
+    return data_key[:31 - len(suffix)] + suffix
+
+
+def write_xlsx(tables: Dict[str, ColumnarTable], output: IO[bytes], chunk_rows: int = XLSX_CHUNK_ROWS) -> None:
+    """Pasta de trabalho com uma aba por tabela, gravada em modo write-only (streaming)"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+    per_sheet = XLSX_MAX_ROWS - 1
+    for data_key, table in tables.items():
+        frame = table.to_frame()
+        for part in range(max(math.ceil(len(frame) / per_sheet), 1)):
+            sheet = workbook.create_sheet(_sheet_title(data_key, part))
+            sheet.freeze_panes = 'A2'
+            header = []
+            for col in frame.columns:
+                cell = WriteOnlyCell(sheet, value=str(col))
+                cell.font = bold
+                header.append(cell)
+            sheet.append(header)
+            # Números e datas são gravados com o tipo da célula (datas recebem formato de data)
+            for row in _xlsx_rows(frame.iloc[part * per_sheet:(part + 1) * per_sheet], chunk_rows):
+                sheet.append(row)
+    workbook.save(output)
+
+
+def export_xlsx(tables: Dict[str, ColumnarTable]) -> bytes:
+    """Planilha com todas as tabelas, reaproveitada do cache enquanto nenhuma tabela mudar"""
+    key = ('xlsx', tuple((data_key, table.fingerprint) for data_key, table in tables.items()))
+    return _cached_export(key, lambda output: write_xlsx(tables, output))
+
+
+def xlsx_download(tables: Dict[str, ColumnarTable]) -> Callable[[], bytes]:
+    """Função para o data do st.download_button (planilha gerada apenas no clique)"""
+    return lambda: export_xlsx(tables)
@@ -0,0 +1,359 @@
+"""
+Modelo de tabelas fato (eventos de leads e vendas) e especificação das
+agregações que derivam cada dataset dados_*
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Tuple, Optional
+
+# Colunas das tabelas fato
+FACT_SCHEMAS = {
+    # Uma linha por venda
+    "sales_facts": ["lead_id", "date", "uf", "loja", "cidade", "marca", "modelo", "categoria", "valor"],
+    # Uma linha por visita de lead a um veículo
+    "lead_facts": ["lead_id", "date", "genero", "idade", "status_profissional", "renda",
+                   "marca", "modelo", "classificacao", "idade_veiculo"]
+}
+
+MESES_ABREVIADOS = ['jan', 'fev', 'mar', 'abr', 'mai', 'jun', 'jul', 'ago', 'set', 'out', 'nov', 'dez']
+
+# Ordem 0 = domingo (mesma convenção de strftime('%w') e EXTRACT(DOW))
+DIAS_SEMANA = ['domingo', 'segunda', 'terça', 'quarta', 'quinta', 'sexta', 'sábado']
+
+# Faixas: (limite inferior inclusivo, limite superior exclusivo, rótulo, ordem)
+FAIXAS_ETARIAS = [
+    (0, 20, '0-20', 1),
+    (20, 40, '20-40', 2),
+    (40, 60, '40-60', 3),
+    (60, 80, '60-80', 4),
+    (80, None, '80+', 5)
+]
+
+FAIXAS_SALARIAIS = [
+    (0, 5000, '0-5000', 1),
+    (5000, 10000, '5000-10000', 2),
+    (10000, 15000, '10000-15000', 3),
+    (15000, 20000, '15000-20000', 4),
+    (20000, None, '20000+', 5)
+]
+
+FAIXAS_IDADE_VEICULO = [
+    (0, 2, 'até 2 anos', 1),
+    (2, 4, 'de 2 à 4 anos', 2),
+    (4, 6, 'de 4 à 6 anos', 3),
+    (6, 8, 'de 6 à 8 anos', 4),
+    (8, 10, 'de 8 à 10 anos', 5),
+    (10, None, 'acima de 10 anos', 6)
+]
+
+# Chaves derivadas: nome -> (coluna de origem, tipo de derivação, faixas)
+DERIVED_KEYS = {
+    'mes': ('date', 'month', None),
+    'dia': ('date', 'weekday', None),
+    'faixa_etaria': ('idade', 'bins', FAIXAS_ETARIAS),
+    'faixa_salarial': ('renda', 'bins', FAIXAS_SALARIAIS),
+    'faixa_idade_veiculo': ('idade_veiculo', 'bins', FAIXAS_IDADE_VEICULO)
+}
+
+# Referência de estados (capitais) para dados_estados
+UF_REFERENCE = {
+    'AC': ('Acre', -9.9747, -67.8243, 'Norte'),
+    'AL': ('Alagoas', -9.6658, -35.7353, 'Nordeste'),
+    'AP': ('Amapá', 0.0349, -51.0694, 'Norte'),
+    'AM': ('Amazonas', -3.1190, -60.0217, 'Norte'),
+    'BA': ('Bahia', -12.9714, -38.5014, 'Nordeste'),
+    'CE': ('Ceará', -3.7319, -38.5267, 'Nordeste'),
+    'DF': ('Distrito Federal', -15.7939, -47.8828, 'Centro-Oeste'),
+    'ES': ('Espírito Santo', -20.3155, -40.3128, 'Sudeste'),
+    'GO': ('Goiás', -16.6869, -49.2648, 'Centro-Oeste'),
+    'MA': ('Maranhão', -2.5307, -44.3068, 'Nordeste'),
+    'MT': ('Mato Grosso', -15.6014, -56.0979, 'Centro-Oeste'),
+    'MS': ('Mato Grosso do Sul', -20.4697, -54.6201, 'Centro-Oeste'),
+    'MG': ('Minas Gerais', -19.9167, -43.9345, 'Sudeste'),
+    'PA': ('Pará', -1.4558, -48.4902, 'Norte'),
+    'PB': ('Paraíba', -7.1195, -34.8450, 'Nordeste'),
+    'PR': ('Paraná', -25.4284, -49.2733, 'Sul'),
+    'PE': ('Pernambuco', -8.0476, -34.8770, 'Nordeste'),
+    'PI': ('Piauí', -5.0920, -42.8038, 'Nordeste'),
+    'RJ': ('Rio de Janeiro', -22.9068, -43.1729, 'Sudeste'),
+    'RN': ('Rio Grande do Norte', -5.7945, -35.2110, 'Nordeste'),
+    'RS': ('Rio Grande do Sul', -30.0346, -51.2177, 'Sul'),
+    'RO': ('Rondônia', -8.7612, -63.9004, 'Norte'),
+    'RR': ('Roraima', 2.8235, -60.6758, 'Norte'),
+    'SC': ('Santa Catarina', -27.5954, -48.5480, 'Sul'),
+    'SP': ('São Paulo', -23.5505, -46.6333, 'Sudeste'),
+    'SE': ('Sergipe', -10.9472, -37.0731, 'Nordeste'),
+    'TO': ('Tocantins', -10.2491, -48.3243, 'Norte')
+}
+
+# Agregações por dataset: lista de (tabela fato, chaves de agrupamento, medidas)
+# Medidas: nome -> (função, coluna) com função em count, count_distinct, sum, max
+FACT_AGGREGATIONS: Dict[str, List[Tuple[str, List[str], Dict[str, Tuple[str, str]]]]] = {
+    'dados_mensais': [
+        ('lead_facts', ['mes'], {'leads': ('count_distinct', 'lead_id')}),
+        ('sales_facts', ['mes'], {'vendas': ('count', 'lead_id'), 'receita': ('sum', 'valor')})
+    ],
+    'dados_estados': [
+        ('sales_facts', ['uf'], {'vendas': ('count', 'lead_id')})
+    ],
+    'dados_marcas': [
+        ('sales_facts', ['marca'], {'vendas': ('count', 'lead_id'), 'categoria': ('max', 'categoria')})
+    ],
+    'dados_lojas': [
+        ('sales_facts', ['loja'], {'vendas': ('count', 'lead_id'), 'cidade': ('max', 'cidade'), 'estado': ('max', 'uf')})
+    ],
+    'dados_visitas': [
+        ('lead_facts', ['dia'], {'visitas': ('count', 'lead_id')})
+    ],
+    'dados_genero': [
+        ('lead_facts', ['genero'], {'leads': ('count_distinct', 'lead_id')})
+    ],
+    'dados_status_profissional': [
+        ('lead_facts', ['status_profissional'], {'leads': ('count_distinct', 'lead_id')})
+    ],
+    'dados_faixa_etaria': [
+        ('lead_facts', ['faixa_etaria'], {'leads': ('count_distinct', 'lead_id')})
+    ],
+    'dados_faixa_salarial': [
+        ('lead_facts', ['faixa_salarial'], {'leads': ('count_distinct', 'lead_id')})
+    ],
+    'dados_classificacao_veiculo': [
+        ('lead_facts', ['classificacao'], {'visitas': ('count', 'lead_id')})
+    ],
+    'dados_idade_veiculo': [
+        ('lead_facts', ['faixa_idade_veiculo'], {'visitas': ('count', 'lead_id')})
+    ],
+    'dados_veiculos_visitados': [
+        ('lead_facts', ['marca', 'modelo'], {'visitas': ('count', 'lead_id')})
+    ]
+}
+
+
+def month_label(month_key: int) -> str:
+    """Converte chave AAAAMM no rótulo usado nos dados ('set-20')"""
+    year, month = divmod(int(month_key), 100)
+    return f"{MESES_ABREVIADOS[month - 1]}-{year % 100:02d}"
+
+
+def _percent(counts: pd.Series) -> pd.Series:
+    total = counts.sum()
+    if total <= 0:
+        return counts * 0
+    return (counts / total * 100).round().astype(int)
+
+
+def _bin_frame(grouped: pd.DataFrame, key: str, bins: list, measure: str, target: str) -> pd.DataFrame:
+    """Completa todas as faixas (inclusive vazias) na ordem definida"""
+    counts = grouped.set_index(key)[measure] if not grouped.empty else pd.Series(dtype=float)
+    labels = [label for _, _, label, _ in bins]
+    counts = counts.reindex(labels, fill_value=0)
+    return pd.DataFrame({
+        'faixa': labels,
+        target: _percent(counts).values,
+        'ordem': [ordem for _, _, _, ordem in bins]
+    })
+
+
+def finalize_aggregation(data_key: str, parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Converte os resultados agrupados (um por entrada de FACT_AGGREGATIONS)
+    no formato exato esperado pelo DataValidator
+    """
+    parts = [part.dropna(subset=[c for c in part.columns if c in spec[1]]) for part, spec in zip(parts, FACT_AGGREGATIONS[data_key])]
+
+    if data_key == 'dados_mensais':
+        leads, vendas = parts
+        df = leads.merge(vendas, on='mes', how='outer').fillna({'leads': 0, 'vendas': 0, 'receita': 0})
+        df = df.sort_values('mes')
+        leads_col = df['leads'].astype(int)
+        vendas_col = df['vendas'].astype(int)
+        receita_col = df['receita'].astype(float)
+        return pd.DataFrame({
+            'mes': df['mes'].map(month_label).values,
+            'leads': leads_col.values,
+            'vendas': vendas_col.values,
+            'receita': receita_col.values,
+            'conversao': (vendas_col / leads_col.where(leads_col > 0)).fillna(0).round(2).values,
+            'ticket_medio': (receita_col / vendas_col.where(vendas_col > 0)).fillna(0).round(1).values
+        })
+
+    if data_key == 'dados_estados':
+        df = parts[0].sort_values('vendas', ascending=False)
+        reference = df['uf'].map(lambda uf: UF_REFERENCE.get(uf, (uf, None, None, 'N/D')))
+        return pd.DataFrame({
+            'estado': [ref[0] for ref in reference],
+            'uf': df['uf'].values,
+            'vendas': df['vendas'].astype(int).values,
+            'lat': pd.to_numeric([ref[1] for ref in reference]),
+            'lon': pd.to_numeric([ref[2] for ref in reference]),
+            'regiao': [ref[3] for ref in reference]
+        })
+
+    if data_key == 'dados_marcas':
+        df = parts[0].sort_values('vendas', ascending=False)
+        return pd.DataFrame({
+            'marca': df['marca'].values,
+            'vendas': df['vendas'].astype(int).values,
+            'categoria': df['categoria'].fillna('N/D').values
+        })
+
+    if data_key == 'dados_lojas':
+        df = parts[0].sort_values('vendas', ascending=False)
+        return pd.DataFrame({
+            'loja': df['loja'].values,
+            'vendas': df['vendas'].astype(int).values,
+            'cidade': df['cidade'].values,
+            'estado': df['estado'].values
+        })
+
+    if data_key == 'dados_visitas':
+        counts = parts[0].set_index('dia')['visitas'] if not parts[0].empty else pd.Series(dtype=float)
+        counts = counts.reindex(range(len(DIAS_SEMANA)), fill_value=0)
+        return pd.DataFrame({
+            'dia_semana': DIAS_SEMANA,
+            'visitas': counts.astype(int).values,
+            'ordem': list(range(len(DIAS_SEMANA)))
+        })
+
+    if data_key == 'dados_genero':
+        df = parts[0].sort_values('leads', ascending=False)
+        return pd.DataFrame({'genero': df['genero'].values, 'leads': df['leads'].astype(int).values})
+
+    if data_key == 'dados_status_profissional':
+        df = parts[0].sort_values('leads')
+        return pd.DataFrame({'status': df['status_profissional'].values, 'leads_percent': _percent(df['leads']).values})
+
+    if data_key == 'dados_faixa_etaria':
+        return _bin_frame(parts[0], 'faixa_etaria', FAIXAS_ETARIAS, 'leads', 'leads_percent')[['faixa', 'leads_percent']]
+
+    if data_key == 'dados_faixa_salarial':
+        return _bin_frame(parts[0], 'faixa_salarial', FAIXAS_SALARIAIS, 'leads', 'leads_percent')
+
+    if data_key == 'dados_classificacao_veiculo':
+        df = parts[0].sort_values('classificacao')
+        return pd.DataFrame({'classificacao': df['classificacao'].values, 'visitas': df['visitas'].astype(int).values})
+
+    if data_key == 'dados_idade_veiculo':
+        df = _bin_frame(parts[0], 'faixa_idade_veiculo', FAIXAS_IDADE_VEICULO, 'visitas', 'visitas_percent')
+        return df.rename(columns={'faixa': 'idade'})
+
+    if data_key == 'dados_veiculos_visitados':
+        df = parts[0].sort_values(['marca', 'modelo'])
+        return pd.DataFrame({
+            'marca': df['marca'].values,
+            'modelo': df['modelo'].values,
+            'visitas': df['visitas'].astype(int).values
+        })
+
+    raise KeyError(f"Agregação não configurada para {data_key}")
+
+
+# Funções de agregação do pandas equivalentes às medidas da especificação
+_PANDAS_FUNCTIONS = {
+    'count': 'count',
+    'count_distinct': 'nunique',
+    'sum': 'sum',
+    'max': 'max'
+}
+
+
+def _bin_codes(values: pd.Series, bins: list) -> pd.Categorical:
+    """Classifica valores numéricos nas faixas (vetorizado, faixas contíguas)"""
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    lowers = np.array([lower for lower, _, _, _ in bins], dtype=float)
+    codes = np.searchsorted(lowers, numbers, side='right') - 1
+    codes = np.where((codes >= 0) & ~np.isnan(numbers), codes, -1)
+    return pd.Categorical.from_codes(codes, categories=[label for _, _, label, _ in bins])
+
+
+class FactAggregator:
+    """
+    Deriva os datasets dados_* a partir das tabelas fato em memória.
+
+    As chaves derivadas (mês, dia da semana, faixas) e a codificação
+    categórica das chaves de texto são calculadas uma única vez por tabela
+    fato; cada dataset é então um único groupby vetorizado.
+    """
+
+    def __init__(self, sales_facts: pd.DataFrame = None, lead_facts: pd.DataFrame = None):
+        self._facts: Dict[str, pd.DataFrame] = {}
+        if sales_facts is not None:
+            self._facts['sales_facts'] = self.prepare('sales_facts', sales_facts)
+        if lead_facts is not None:
+            self._facts['lead_facts'] = self.prepare('lead_facts', lead_facts)
+
+    @staticmethod
+    def validate_facts(fact: str, df: pd.DataFrame) -> Tuple[bool, str]:
+        """Verifica se a tabela fato possui as colunas usadas nas agregações"""
+        required = {col for aggs in FACT_AGGREGATIONS.values() for f, keys, measures in aggs if f == fact
+                    for col in [DERIVED_KEYS[k][0] if k in DERIVED_KEYS else k for k in keys] + [c for _, c in measures.values()]}
+        missing = sorted(col for col in required if col not in df.columns)
+        if missing:
+            return False, f"Colunas obrigatórias faltando em {fact}: {', '.join(missing)}"
+        return True, "Tabela fato válida"
+
+    @staticmethod
+    def prepare(fact: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Calcula as chaves derivadas e codifica as chaves de agrupamento"""
+        is_valid, message = FactAggregator.validate_facts(fact, df)
+        if not is_valid:
+            raise ValueError(message)
+
+        used_keys = {k for aggs in FACT_AGGREGATIONS.values() for f, keys, _ in aggs if f == fact for k in keys}
+        prepared = {}
+        for key in used_keys:
+            if key in DERIVED_KEYS:
+                source, kind, bins = DERIVED_KEYS[key]
+                if kind == 'bins':
+                    prepared[key] = _bin_codes(df[source], bins)
+                else:
+                    dates = pd.to_datetime(df[source], errors='coerce')
+                    if kind == 'month':
+                        prepared[key] = dates.dt.year * 100 + dates.dt.month
+                    else:
+                        prepared[key] = (dates.dt.dayofweek + 1) % 7
+            else:
+                prepared[key] = df[key].astype('category')
+
+        measure_columns = {c for aggs in FACT_AGGREGATIONS.values() for f, _, measures in aggs if f == fact
+                           for _, c in measures.values()}
+        for col in measure_columns:
+            if col not in prepared:
+                prepared[col] = df[col]
+        # Colunas que são chave e medida (ex.: uf) precisam da versão original
+        for col in measure_columns & used_keys:
+            prepared[f"_{col}_valor"] = df[col]
+        return pd.DataFrame(prepared)
+
+    def has_facts(self, data_key: str) -> bool:
+        """Indica se as tabelas fato necessárias para o dataset foram carregadas"""
+        return all(fact in self._facts for fact, _, _ in FACT_AGGREGATIONS[data_key])
+
+    def aggregate(self, data_key: str) -> Optional[pd.DataFrame]:
+        """Deriva um dataset dados_* (None se faltar tabela fato)"""
+        if data_key not in FACT_AGGREGATIONS or not self.has_facts(data_key):
+            return None
+
+        parts = []
+        for fact, keys, measures in FACT_AGGREGATIONS[data_key]:
+            frame = self._facts[fact]
+            named = {}
+            for name, (function, col) in measures.items():
+                source_col = f"_{col}_valor" if f"_{col}_valor" in frame.columns else col
+                named[name] = pd.NamedAgg(column=source_col, aggfunc=_PANDAS_FUNCTIONS[function])
+            grouped = frame.groupby(keys, observed=True, sort=False, dropna=True).agg(**named).reset_index()
+            for key in keys:
+                if isinstance(grouped[key].dtype, pd.CategoricalDtype):
+                    grouped[key] = grouped[key].astype(object)
+            parts.append(grouped)
+        return finalize_aggregation(data_key, parts)
+
+    def aggregate_all(self) -> Dict[str, pd.DataFrame]:
+        """Deriva todos os datasets possíveis com as tabelas fato carregadas"""
+        results = {}
+        for data_key in FACT_AGGREGATIONS:
+            df = self.aggregate(data_key)
+            if df is not None:
+                results[data_key] = df
+        return results
@@ -0,0 +1,97 @@
+"""
+Fingerprint de conteúdo dos datasets, usado como chave de cache.
+
+As tabelas do DatasetStore calculam o fingerprint uma única vez por versão.
+As visões DataFrame entregues pelo store ficam registradas, de modo que
+fingerprint_frame() as reconhece sem reler os dados; qualquer outro
+DataFrame (ou visão alterada) tem o conteúdo das colunas hasheado.
+"""
+
+import hashlib
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+_VIEWS: Dict[int, Tuple[Any, str, Tuple]] = {}
+_VIEWS_LOCK = threading.Lock()
+
+
+def _column_bytes(values: Any) -> bytes:
+    """Bytes representativos do conteúdo de uma coluna"""
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return np.ascontiguousarray(values).view(np.uint8).tobytes()
+    hashed = pd.util.hash_pandas_object(pd.Series(values, copy=False), index=False, categorize=False)
+    return hashed.to_numpy().tobytes()
+
+
+def _column_values(column: pd.Series) -> Any:
+    return column.to_numpy() if isinstance(column.dtype, np.dtype) else column.array
+
+
+def fingerprint_columns(columns: Any, index: pd.Index = None) -> str:
+    """Hash (blake2b) dos nomes, tipos e buffers das colunas (dict ou pares nome/valores)"""
+    digest = hashlib.blake2b(digest_size=16)
+    items = columns.items() if isinstance(columns, dict) else columns
+    for name, values in items:
+        digest.update(repr((name, str(values.dtype), len(values))).encode())
+        digest.update(_column_bytes(values))
+    if index is not None and not isinstance(index, pd.RangeIndex):
+        digest.update(_column_bytes(index.to_numpy()))
+    elif index is not None:
+        digest.update(repr((index.start, index.step)).encode())
+    return digest.hexdigest()
+
+
+def _buffer_token(values: Any) -> Optional[Tuple]:
+    """Identifica os buffers de uma coluna; None se não for possível verificar"""
+    if isinstance(values, np.ndarray):
+        return (values.__array_interface__['data'][0], values.strides, len(values))
+    if isinstance(values, pd.Categorical):
+        return _buffer_token(values.codes)
+    if isinstance(getattr(values, '_data', None), np.ndarray) and isinstance(getattr(values, '_mask', None), np.ndarray):
+        return (_buffer_token(values._data), _buffer_token(values._mask))
+    if hasattr(values, '_pa_array'):
+        chunks = values._pa_array.chunks
+        return tuple(buf.address if buf is not None else None for chunk in chunks for buf in chunk.buffers())
+    return None
+
+
+def _frame_tokens(frame: pd.DataFrame) -> Optional[Tuple]:
+    tokens = []
+    for position, name in enumerate(frame.columns):
+        token = _buffer_token(_column_values(frame.iloc[:, position]))
+        if token is None:
+            return None
+        tokens.append((name, token))
+    return (len(frame), tuple(tokens))
+
+
+def register_view(frame: pd.DataFrame, fingerprint: str) -> None:
+    """Registra uma visão do store com o fingerprint da tabela de origem"""
+    tokens = _frame_tokens(frame)
+    if tokens is None:
+        return
+    key = id(frame)
+
+    def _forget(_ref, key=key):
+        with _VIEWS_LOCK:
+            entry = _VIEWS.get(key)
+            if entry is not None and entry[0] is _ref:
+                del _VIEWS[key]
+
+    with _VIEWS_LOCK:
+        _VIEWS[key] = (weakref.ref(frame, _forget), fingerprint, tokens)
+
+
+def fingerprint_frame(frame: pd.DataFrame) -> str:
+    """
+    Fingerprint de um DataFrame. Visões do DatasetStore não alteradas
+    reutilizam o fingerprint da tabela; os demais têm o conteúdo hasheado.
+    """
+    entry = _VIEWS.get(id(frame))
+    if entry is not None and entry[0]() is frame and _frame_tokens(frame) == entry[2]:
+        return entry[1]
+    columns = [(name, _column_values(frame.iloc[:, position])) for position, name in enumerate(frame.columns)]
+    return fingerprint_columns(columns, frame.index)
@@ -0,0 +1,296 @@
+"""
+Ingestão de uma pasta de extrações (ex.: cargas noturnas por tabela).
+
+Cada arquivo é associado a uma tabela dados_* pelo nome da subpasta
+(dados_mensais/2024-10-01.csv) ou pelo prefixo do nome do arquivo
+(dados_mensais_2024-10-01.parquet), inclusive compactados (.csv.gz,
+.csv.zst); em um .zip, cada membro é associado pelo próprio nome.
+
+Um manifesto JSON na própria pasta registra caminho, tamanho, mtime e
+hash de cada arquivo processado: arquivos com tamanho e mtime inalterados
+não são relidos, e arquivos tocados mas com o mesmo conteúdo (mesmo hash)
+não são reimportados. Arquivos inválidos ou com erro são tentados de novo
+a cada verificação.
+
+As linhas importadas ficam apenas nas tabelas base em memória do processo.
+O manifesto guarda o identificador dessa carga (SharedDatasets.base_id):
+depois de um reinício (ou com outro registro de tabelas), os arquivos já
+importados são reaplicados sobre a base atual, na mesma ordem.
+
+Os arquivos novos passam pela mesma validação em blocos da importação
+manual e são aplicados às tabelas base compartilhadas por upsert na chave
+primária, em ordem de modificação (a extração mais recente prevalece).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.core.dataset_store import SHARED_DATASETS, SharedDatasets
+from utils.core.readers import archive_members, is_archive, is_supported, open_member, split_compression
+from utils.core.streaming import DEFAULT_CHUNK_ROWS, stream_import
+from utils.core.validation import DataValidator
+
+MANIFEST_NAME = ".ingest_manifest.json"
+HASH_BLOCK_BYTES = 1024 * 1024
+# Intervalo mínimo entre gravações do manifesto durante a ingestão
+MANIFEST_SAVE_SECONDS = 2.0
+
+INGESTED = "importado"
+UNCHANGED = "sem alterações"
+INVALID = "inválido"
+FAILED = "erro"
+UNMATCHED = "tabela não identificada"
+# Arquivos com estes status são tentados de novo a cada verificação
+# (erro de leitura transitório, regra de validação corrigida depois)
+RETRY_STATUSES = (INVALID, FAILED)
+
+# Uma ingestão por pasta de cada vez (o manifesto é compartilhado entre sessões)
+_ROOT_LOCKS: Dict[str, threading.Lock] = {}
+_ROOT_LOCKS_GUARD = threading.Lock()
+
+
+def _root_lock(root: str) -> threading.Lock:
+    with _ROOT_LOCKS_GUARD:
+        return _ROOT_LOCKS.setdefault(os.path.realpath(root), threading.Lock())
+
+
+class IngestResult:
+    """Resultado do processamento de um arquivo da pasta"""
+
+    def __init__(self, path: str, data_key: Optional[str], status: str, message: str = "",
+                 rows: int = 0, inserted: int = 0, updated: int = 0):
+        self.path = path
+        self.data_key = data_key
+        self.status = status
+        self.message = message
+        self.rows = rows
+        self.inserted = inserted
+        self.updated = updated
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "arquivo": self.path,
+            "tabela": self.data_key or "",
+            "status": self.status,
+            "registros": self.rows,
+            "inseridos": self.inserted,
+            "atualizados": self.updated,
+            "mensagem": self.message
+        }
+
+
+def file_hash(path: str) -> str:
+    """Hash (blake2b) do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_data_files(root: str) -> Iterator[os.DirEntry]:
+    """Arquivos com extensão suportada, percorrendo subpastas com os.scandir"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and is_supported(entry.name):
+                    yield entry
+
+
+def watch_subfolders(root: str) -> List[str]:
+    """Subpastas diretas da pasta monitorada (nomes relativos)"""
+    with os.scandir(root) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."))
+
+
+def resolve_watch_path(root: str, relative_path: str = "") -> str:
+    """
+    Caminho real de uma subpasta da pasta monitorada. Caminhos que saem da
+    pasta (.., links simbólicos, absolutos) são recusados: a ingestão grava
+    o manifesto na pasta e altera as tabelas base de todas as sessões.
+    """
+    root_real = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root_real, relative_path))
+    if os.path.commonpath([root_real, path]) != root_real:
+        raise ValueError(f"Pasta fora da pasta de importação configurada: {relative_path}")
+    return path
+
+
+def match_data_key(relative_path: str, data_keys: List[str]) -> Optional[str]:
+    """Tabela de destino: subpasta com o nome da tabela ou prefixo do nome do arquivo (sem .gz/.zst)"""
+    parts = relative_path.replace(os.sep, "/").split("/")
+    for folder in parts[:-1]:
+        if folder in data_keys:
+            return folder
+    stem = os.path.splitext(split_compression(parts[-1])[0])[0]
+    candidates = [key for key in data_keys if stem == key or stem.startswith(key + "_") or stem.startswith(key + "-")]
+    return max(candidates, key=len) if candidates else None
+
+
+class IngestManifest:
+    """Manifesto dos arquivos processados (JSON gravado de forma atômica)"""
+
+    def __init__(self, path: str, base_id: str = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.base_id = base_id
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                content = json.load(handle)
+            self.entries = content.get("arquivos", {})
+            if base_id is None:
+                self.base_id = content.get("base")
+            elif content.get("base") != base_id:
+                # Importações feitas sobre outra carga da base: só os arquivos sem tabela continuam válidos
+                self.entries = {path: entry for path, entry in self.entries.items() if entry.get("status") == UNMATCHED}
+
+    def is_current(self, relative_path: str, size: int, mtime_ns: int) -> bool:
+        entry = self.entries.get(relative_path)
+        return (entry is not None and entry["size"] == size and entry["mtime_ns"] == mtime_ns
+                and entry.get("status") not in RETRY_STATUSES)
+
+    def record(self, relative_path: str, size: int, mtime_ns: int, content_hash: str, **details) -> None:
+        self.entries[relative_path] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "hash": content_hash,
+            "processado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **details
+        }
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ingest_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"base": self.base_id, "arquivos": self.entries}, handle, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def pending_files(root: str, manifest: IngestManifest) -> List[Tuple[str, os.stat_result]]:
+    """
+    Arquivos novos, com tamanho/mtime diferentes do manifesto ou que
+    falharam na última tentativa, do mais antigo para o mais recente.
+    Arquivos já processados não são abertos.
+    """
+    pending = []
+    for entry in iter_data_files(root):
+        relative_path = os.path.relpath(entry.path, root)
+        stat = entry.stat()
+        if not manifest.is_current(relative_path, stat.st_size, stat.st_mtime_ns):
+            pending.append((relative_path, stat))
+    pending.sort(key=lambda item: (item[1].st_mtime_ns, item[0]))
+    return pending
+
+
+def ingest_directory(root: str, datasets: SharedDatasets = None, manifest_path: str = None,
+                     chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     on_file: Callable[[int, int, str], None] = None) -> List[IngestResult]:
+    """
+    Importa os arquivos novos ou alterados da pasta para as tabelas base.
+    on_file recebe (posição, total, caminho) antes de cada arquivo.
+    O manifesto é gravado periodicamente e ao final; se o processo cair no
+    meio, os últimos arquivos são reprocessados (o upsert é idempotente).
+    Com um manifesto de outra carga da base, todos os arquivos são reaplicados.
+    """
+    datasets = datasets if datasets is not None else SHARED_DATASETS
+    with _root_lock(root):
+        manifest = IngestManifest(manifest_path or os.path.join(root, MANIFEST_NAME), base_id=datasets.base_id)
+        data_keys = list(DataValidator.get_validations().keys())
+        pending = pending_files(root, manifest)
+
+        results = []
+        saved_at = time.time()
+        try:
+            for position, (relative_path, stat) in enumerate(pending):
+                if on_file is not None:
+                    on_file(position, len(pending), relative_path)
+                results.extend(_process_file(root, relative_path, stat, manifest, data_keys, datasets, chunk_rows))
+                if time.time() - saved_at >= MANIFEST_SAVE_SECONDS:
+                    manifest.save()
+                    saved_at = time.time()
+        finally:
+            if pending:
+                manifest.save()
+        return results
+
+
+def _process_file(root: str, relative_path: str, stat: os.stat_result, manifest: IngestManifest,
+                  data_keys: List[str], datasets: SharedDatasets, chunk_rows: int) -> List[IngestResult]:
+    path = os.path.join(root, relative_path)
+    archive = is_archive(relative_path)
+    data_key = None if archive else match_data_key(relative_path, data_keys)
+    if not archive and data_key is None:
+        # Registrado sem ler o conteúdo para não ser reavaliado a cada verificação
+        manifest.record(relative_path, stat.st_size, stat.st_mtime_ns, None, status=UNMATCHED)
+        return [IngestResult(relative_path, None, UNMATCHED)]
+
+    content_hash = file_hash(path)
+    previous = manifest.entries.get(relative_path)
+    if previous is not None and previous["hash"] == content_hash and previous.get("status") not in RETRY_STATUSES:
+        # Arquivo tocado sem mudança de conteúdo: apenas atualiza tamanho/mtime
+        details = {key: value for key, value in previous.items() if key not in ("size", "mtime_ns", "hash", "processado_em")}
+        manifest.record(relative_path, stat.st_size, stat.st_mtime_ns, content_hash, **details)
+        return [IngestResult(relative_path, data_key, UNCHANGED)]
+
+    if archive:
+        results = _ingest_archive(path, relative_path, data_keys, datasets, chunk_rows)
+    else:
+        results = [_ingest_file(path, relative_path, data_key, datasets, chunk_rows)]
+    failed = [result.status for result in results if result.status != INGESTED]
+    manifest.record(relative_path, stat.st_size, stat.st_mtime_ns, content_hash,
+                    tabela=", ".join(sorted({result.data_key for result in results if result.data_key})),
+                    status=failed[0] if failed else INGESTED,
+                    registros=sum(result.rows for result in results))
+    return results
+
+
+def _ingest_archive(path: str, relative_path: str, data_keys: List[str], datasets: SharedDatasets,
+                    chunk_rows: int) -> List[IngestResult]:
+    """Importa cada membro do .zip na tabela indicada pelo nome do membro (ou do próprio .zip)"""
+    try:
+        members = archive_members(path)
+    except Exception as e:
+        return [IngestResult(relative_path, None, FAILED, str(e))]
+    results = []
+    for member in members:
+        member_path = f"{relative_path}/{member}"
+        data_key = match_data_key(member, data_keys) or match_data_key(relative_path, data_keys)
+        if data_key is None:
+            results.append(IngestResult(member_path, None, UNMATCHED))
+            continue
+        with open(path, "rb") as handle:
+            results.append(_ingest_file(open_member(handle, member), member_path, data_key, datasets, chunk_rows))
+    return results
+
+
+def _ingest_file(source: Any, relative_path: str, data_key: str, datasets: SharedDatasets,
+                 chunk_rows: int) -> IngestResult:
+    try:
+        imported = stream_import(source, data_key, chunk_rows=chunk_rows)
+    except Exception as e:
+        return IngestResult(relative_path, data_key, FAILED, str(e))
+    if not imported.is_valid:
+        return IngestResult(relative_path, data_key, INVALID, imported.message, imported.rows)
+
+    key_columns = DataValidator.get_primary_key(data_key)
+    if key_columns:
+        inserted, updated = datasets.upsert(data_key, imported.table.to_frame(), key_columns)
+    else:
+        datasets.replace(data_key, imported.table)
+        inserted, updated = imported.rows, 0
+    return IngestResult(relative_path, data_key, INGESTED, imported.message, imported.rows, inserted, updated)
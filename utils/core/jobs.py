@@ -0,0 +1,177 @@
+"""
+Importações em segundo plano.
+
+A leitura e validação dos arquivos roda em um pool de threads do processo,
+liberando a thread do script Streamlit: a página apenas consulta o
+progresso do job (registro por sessão) e pode cancelá-lo. A tabela final
+só é gravada no DatasetStore na confirmação, em uma única troca atômica.
+"""
+
+import io
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from utils.core.readers import detect_format, open_member
+from utils.core.streaming import StreamingImportResult, stream_import
+from utils.core.validation import DataValidator, ValidationStats
+
+# Threads dedicadas às importações (compartilhadas por todas as sessões)
+JOB_THREADS = max(int(os.environ.get("IMPORT_JOB_THREADS", 2)), 1)
+# Intervalo mínimo entre recálculos dos avisos durante a importação
+WARNINGS_INTERVAL = 0.5
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=JOB_THREADS, thread_name_prefix="import")
+        return _EXECUTOR
+
+
+class ImportCancelled(Exception):
+    """Importação interrompida pelo usuário"""
+
+
+class ImportJob:
+    """Importação de um arquivo executada em segundo plano"""
+
+    PENDING = "na fila"
+    RUNNING = "executando"
+    DONE = "concluído"
+    CANCELLED = "cancelado"
+    FAILED = "erro"
+
+    def __init__(self, data_key: str, file_name: str, upload_id: Any = None):
+        self.id = uuid.uuid4().hex[:8]
+        self.data_key = data_key
+        self.file_name = file_name
+        self.upload_id = upload_id
+        self.status = ImportJob.PENDING
+        self.fraction = 0.0
+        self.rows_read = 0
+        self.rows_validated = 0
+        self.warnings: List[str] = []
+        self.result: Optional[StreamingImportResult] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._warnings_at = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ImportJob.DONE, ImportJob.CANCELLED, ImportJob.FAILED)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self) -> None:
+        """Solicita o cancelamento (atendido no próximo bloco lido)"""
+        self._cancel.set()
+        if self.status == ImportJob.PENDING:
+            self.status = ImportJob.CANCELLED
+
+    def _check_cancel(self) -> None:
+        if self._cancel.is_set():
+            raise ImportCancelled()
+
+    def _on_read(self, rows: int) -> None:
+        self.rows_read = rows
+        self._check_cancel()
+
+    def _on_progress(self, stats: Optional[ValidationStats], fraction: float, rows: int) -> None:
+        self.fraction = fraction
+        self.rows_validated = rows
+        now = time.time()
+        if stats is not None and now - self._warnings_at >= WARNINGS_INTERVAL:
+            self.warnings = stats.warnings()
+            self._warnings_at = now
+        self._check_cancel()
+
+    def run(self, source: Any, file_format: str, **options) -> None:
+        if self._cancel.is_set():
+            self.status = ImportJob.CANCELLED
+            return
+        self.status = ImportJob.RUNNING
+        self.started_at = time.time()
+        validation = DataValidator.get_validation_info(self.data_key)
+        stats = ValidationStats(validation, DataValidator.get_plan(self.data_key)) if validation else None
+        try:
+            result = stream_import(
+                source, self.data_key, file_format=file_format, stats=stats, on_read=self._on_read,
+                on_progress=lambda fraction, rows: self._on_progress(stats, fraction, rows), **options
+            )
+            self.warnings = stats.warnings() if stats is not None else []
+            self.result = result
+            self.status = ImportJob.DONE
+        except ImportCancelled:
+            self.status = ImportJob.CANCELLED
+        except Exception as e:
+            self.error = str(e)
+            self.status = ImportJob.FAILED
+        finally:
+            self.finished_at = time.time()
+
+
+class JobRegistry:
+    """Jobs de importação de uma sessão (no máximo um por tabela)"""
+
+    def __init__(self):
+        self._jobs: Dict[str, ImportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, data_key: str, uploaded_file: Any, upload_id: Any = None, member: str = None, **options) -> ImportJob:
+        """
+        Inicia a importação do arquivo em segundo plano. O conteúdo é
+        envolvido em um buffer próprio do job (sem cópia dos bytes), de modo
+        que o script pode continuar usando o objeto enviado. Em arquivos
+        .zip, member indica o arquivo de dados a importar.
+        """
+        name = getattr(uploaded_file, "name", str(uploaded_file))
+        if hasattr(uploaded_file, "getvalue"):
+            source = io.BytesIO(uploaded_file.getvalue())
+            source.name = name
+            source.size = getattr(uploaded_file, "size", None)
+        else:
+            source = uploaded_file
+        if member is not None:
+            source = open_member(source, member)
+            name = member
+
+        job = ImportJob(data_key, name, upload_id)
+        with self._lock:
+            previous = self._jobs.get(data_key)
+            if previous is not None:
+                previous.cancel()
+            self._jobs[data_key] = job
+        _executor().submit(job.run, source, detect_format(name), **options)
+        return job
+
+    def get(self, data_key: str) -> Optional[ImportJob]:
+        """Job mais recente da tabela"""
+        return self._jobs.get(data_key)
+
+    def jobs(self) -> List[ImportJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active(self) -> List[ImportJob]:
+        return [job for job in self.jobs() if not job.finished]
+
+    def discard(self, data_key: str) -> None:
+        """Remove o job da tabela (cancelando-o se ainda estiver em execução)"""
+        with self._lock:
+            job = self._jobs.pop(data_key, None)
+        if job is not None and not job.finished:
+            job.cancel()
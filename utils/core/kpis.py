@@ -0,0 +1,127 @@
+"""
+Manutenção incremental de KPIs sobre tabelas versionadas do DatasetStore
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.core.dataset_store import ColumnarTable
+
+
+def _numeric(values: Any) -> pd.Series:
+    return pd.to_numeric(pd.Series(values), errors='coerce')
+
+
+def _as_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class KpiState:
+    """Totais, máximo e somas por grupo de uma versão da tabela"""
+
+    def __init__(self, version: int, rows: int, sums: Dict[str, Any], max_value: Any,
+                 max_index: Optional[int], group_sums: Dict[Any, Any]):
+        self.version = version
+        self.rows = rows
+        self.sums = sums
+        self.max_value = max_value
+        self.max_index = max_index
+        self.group_sums = group_sums
+
+
+class KpiAccumulator:
+    """
+    Acumula somas, máximo e somas por grupo de uma tabela.
+
+    O estado é guardado por versão (compartilhado entre sessões). Quando a
+    nova versão é a anterior + linhas adicionadas, apenas as linhas novas
+    são processadas; em substituições ou edições o cálculo completo é
+    refeito de forma vetorizada.
+    """
+
+    MAX_STATES = 256
+
+    def __init__(self, name: str, sum_columns: List[str] = None, max_column: str = None,
+                 group_column: str = None, group_sum_column: str = None):
+        self.name = name
+        self.sum_columns = sum_columns or []
+        self.max_column = max_column
+        self.group_column = group_column
+        self.group_sum_column = group_sum_column
+        self._states: 'OrderedDict[int, KpiState]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _scan(self, table: ColumnarTable, start: int) -> Tuple[Dict[str, Any], Any, Optional[int], Dict[Any, Any]]:
+        """Processa as linhas [start:] da tabela"""
+        columns = table.columns
+        sums = {
+            col: _as_python(_numeric(columns[col][start:]).sum()) if col in columns else 0
+            for col in self.sum_columns
+        }
+
+        max_value, max_index = None, None
+        if self.max_column and self.max_column in columns:
+            values = _numeric(columns[self.max_column][start:])
+            if values.notna().any():
+                position = int(values.idxmax())
+                max_value = _as_python(values.iloc[position])
+                max_index = start + position
+
+        group_sums = {}
+        if self.group_column and self.group_column in columns and self.group_sum_column in columns:
+            keys = pd.Series(columns[self.group_column][start:])
+            values = _numeric(columns[self.group_sum_column][start:])
+            grouped = values.groupby(keys.values, sort=False).sum()
+            group_sums = {key: _as_python(value) for key, value in grouped.items()}
+
+        return sums, max_value, max_index, group_sums
+
+    def _full(self, table: ColumnarTable) -> KpiState:
+        sums, max_value, max_index, group_sums = self._scan(table, 0)
+        return KpiState(table.version, len(table), sums, max_value, max_index, group_sums)
+
+    def _extend(self, parent: KpiState, table: ColumnarTable) -> KpiState:
+        sums, max_value, max_index, group_sums = self._scan(table, parent.rows)
+        merged_sums = {col: parent.sums.get(col, 0) + sums.get(col, 0) for col in self.sum_columns}
+
+        # Empate mantém a primeira ocorrência (mesmo comportamento do cálculo completo)
+        if parent.max_value is None or (max_value is not None and max_value > parent.max_value):
+            best_value, best_index = max_value, max_index
+        else:
+            best_value, best_index = parent.max_value, parent.max_index
+
+        merged_groups = dict(parent.group_sums)
+        for key, value in group_sums.items():
+            merged_groups[key] = merged_groups.get(key, 0) + value
+
+        return KpiState(table.version, len(table), merged_sums, best_value, best_index, merged_groups)
+
+    def compute(self, table: ColumnarTable) -> KpiState:
+        """Retorna o estado dos KPIs para a versão da tabela"""
+        with self._lock:
+            state = self._states.get(table.version)
+            if state is not None:
+                self._states.move_to_end(table.version)
+                return state
+            parent = self._states.get(table.parent_version) if table.parent_version is not None else None
+
+        if parent is not None and table.append_start == parent.rows:
+            state = self._extend(parent, table)
+        else:
+            state = self._full(table)
+
+        with self._lock:
+            self._states[table.version] = state
+            while len(self._states) > self.MAX_STATES:
+                self._states.popitem(last=False)
+        return state
+
+    @staticmethod
+    def row_value(table: ColumnarTable, index: Optional[int], column: str, default: Any = None) -> Any:
+        """Valor de uma coluna na linha indicada (ex.: linha do máximo)"""
+        if index is None or column not in table.columns:
+            return default
+        return _as_python(table.columns[column][index])
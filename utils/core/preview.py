@@ -0,0 +1,75 @@
+"""
+Pré-visualização limitada de tabelas grandes.
+
+Apenas as linhas exibidas (início, fim, amostra ou uma página) são
+enviadas ao navegador; o resumo por coluna é calculado no servidor uma
+vez por versão dos dados (cache pelo fingerprint).
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.core.cache import ANALYTICS_CACHE, freeze, memoize
+
+PREVIEW_ROWS = 50
+PAGE_SIZES = [50, 100, 500]
+
+HEAD = "Início"
+TAIL = "Fim"
+SAMPLE = "Amostra"
+PAGES = "Páginas"
+PREVIEW_MODES = [HEAD, TAIL, SAMPLE, PAGES]
+
+
+def preview_rows(frame: pd.DataFrame, mode: str = HEAD, rows: int = PREVIEW_ROWS,
+                 page: int = 0, seed: int = 0) -> pd.DataFrame:
+    """Recorte de até rows linhas (o índice original é mantido para orientação)"""
+    total = len(frame)
+    if total <= rows:
+        return frame
+    if mode == TAIL:
+        return frame.tail(rows)
+    if mode == SAMPLE:
+        positions = np.sort(np.random.default_rng(seed).choice(total, size=rows, replace=False))
+        return frame.iloc[positions]
+    if mode == PAGES:
+        start = min(max(page, 0) * rows, total)
+        return frame.iloc[start:start + rows]
+    return frame.head(rows)
+
+
+def _summarize_column(column: pd.Series) -> dict:
+    nulls = int(column.isna().sum())
+    summary = {
+        'coluna': str(column.name),
+        'tipo': str(column.dtype),
+        'preenchidos': len(column) - nulls,
+        'nulos': nulls,
+        'distintos': None,
+        'mínimo': None,
+        'máximo': None,
+        'média': None
+    }
+    if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        values = column.to_numpy(dtype='float64', na_value=np.nan)
+        if nulls < len(values):
+            summary['mínimo'] = float(np.nanmin(values))
+            summary['máximo'] = float(np.nanmax(values))
+            summary['média'] = float(np.nanmean(values))
+    else:
+        summary['distintos'] = int(column.nunique(dropna=True))
+    return summary
+
+
+@memoize(ANALYTICS_CACHE, prepare=freeze)
+def _column_summaries(frame: pd.DataFrame) -> tuple:
+    return tuple(_summarize_column(frame.iloc[:, position]) for position in range(frame.shape[1]))
+
+
+def column_summary(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resumo por coluna: tipo, preenchidos, nulos, distintos (texto) e
+    mínimo/máximo/média (numéricas). O cache guarda os registros congelados;
+    cada chamada recebe um DataFrame novo.
+    """
+    return pd.DataFrame(list(_column_summaries(frame)))
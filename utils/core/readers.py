@@ -0,0 +1,268 @@
+"""
+Leitores de arquivos para importação: CSV, Parquet, Feather/Arrow IPC,
+XLSX e JSON lines, opcionalmente compactados (.gz, .zst) ou dentro de
+um .zip.
+
+Todos produzem blocos de DataFrame de tamanho limitado, validados pelo
+mesmo caminho da importação de CSV. Formatos colunares são lidos via Arrow:
+o arquivo enviado é lido direto do buffer (sem cópia) e os blocos são
+fatias da tabela Arrow.
+
+Arquivos compactados são descompactados em fluxo: CSV e JSON lines vão
+direto do descompactador para o leitor em blocos, sem que o conteúdo
+descompactado exista inteiro em memória. Formatos que exigem acesso
+aleatório (Parquet, Arrow, XLSX) são descompactados para um arquivo
+temporário em disco.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import zipfile
+import pandas as pd
+from typing import Any, IO, Iterator, List, Optional, Tuple
+
+FORMAT_EXTENSIONS = {
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'pq': 'parquet',
+    'feather': 'arrow',
+    'arrow': 'arrow',
+    'ipc': 'arrow',
+    'xlsx': 'xlsx',
+    'jsonl': 'jsonl',
+    'ndjson': 'jsonl'
+}
+
+COMPRESSION_EXTENSIONS = {
+    'gz': 'gzip',
+    'zst': 'zstd'
+}
+
+ARCHIVE_EXTENSIONS = ['zip']
+
+# Formatos lidos em fluxo (os demais precisam de acesso aleatório ao arquivo)
+STREAMING_FORMATS = ('csv', 'jsonl')
+
+SUPPORTED_EXTENSIONS: List[str] = list(FORMAT_EXTENSIONS.keys()) + list(COMPRESSION_EXTENSIONS.keys()) + ARCHIVE_EXTENSIONS
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+def split_compression(name: str) -> Tuple[str, Optional[str]]:
+    """Separa a compactação do nome: 'vendas.csv.gz' -> ('vendas.csv', 'gzip')"""
+    base, extension = os.path.splitext(str(name))
+    compression = COMPRESSION_EXTENSIONS.get(extension.lower().lstrip('.'))
+    return (base, compression) if compression else (str(name), None)
+
+
+def is_archive(name: str) -> bool:
+    return os.path.splitext(str(name))[1].lower().lstrip('.') in ARCHIVE_EXTENSIONS
+
+
+def is_supported(name: str) -> bool:
+    """Arquivo com formato suportado (inclusive compactado ou .zip)"""
+    if is_archive(name):
+        return True
+    base, _ = split_compression(name)
+    return os.path.splitext(base)[1].lower().lstrip('.') in FORMAT_EXTENSIONS
+
+
+def detect_format(name: str) -> str:
+    """Formato a partir da extensão do arquivo (ignorando .gz/.zst)"""
+    base, _ = split_compression(name)
+    extension = os.path.splitext(base)[1].lower().lstrip('.')
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Formato de arquivo não suportado: .{extension}")
+    return FORMAT_EXTENSIONS[extension]
+
+
+def detect_compression(name: str) -> Optional[str]:
+    return split_compression(name)[1]
+
+
+def _rewind(source: Any) -> None:
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _arrow_input(source: Any):
+    """Entrada Arrow sem cópia: memory map para caminhos, buffer para uploads"""
+    import pyarrow as pa
+
+    if isinstance(source, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(source), 'r')
+    if hasattr(source, 'getbuffer'):
+        return pa.BufferReader(source.getbuffer())
+    _rewind(source)
+    if hasattr(source, 'fileno') and source.seekable():
+        # Arquivo em disco (ex.: temporário descompactado): leitura sob demanda
+        return pa.PythonFile(source, mode='r')
+    return pa.BufferReader(source.read())
+
+
+def open_decompressed(source: Any, compression: str) -> IO[bytes]:
+    """Fluxo descompactado sobre o arquivo (caminho ou arquivo aberto)"""
+    if compression == 'gzip':
+        if isinstance(source, (str, os.PathLike)):
+            return gzip.open(source, 'rb')
+        _rewind(source)
+        return gzip.GzipFile(fileobj=source, mode='rb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("Arquivos .zst exigem o pacote 'zstandard' (pip install zstandard)")
+        if isinstance(source, (str, os.PathLike)):
+            source = open(source, 'rb')
+        else:
+            _rewind(source)
+        return zstandard.ZstdDecompressor().stream_reader(source, read_across_frames=True)
+    raise ValueError(f"Compactação não suportada: {compression}")
+
+
+def _spool(stream: IO[bytes]) -> IO[bytes]:
+    """Copia o fluxo descompactado para um arquivo temporário em disco"""
+    spooled = tempfile.TemporaryFile()
+    shutil.copyfileobj(stream, spooled, SPOOL_CHUNK_BYTES)
+    spooled.seek(0)
+    return spooled
+
+
+def archive_members(source: Any) -> List[str]:
+    """Arquivos de dados suportados dentro de um .zip"""
+    _rewind(source)
+    with zipfile.ZipFile(source) as archive:
+        return [
+            info.filename for info in archive.infolist()
+            if not info.is_dir() and not os.path.basename(info.filename).startswith('.') and is_supported(info.filename)
+            and not is_archive(info.filename)
+        ]
+
+
+def open_member(source: Any, member: str) -> IO[bytes]:
+    """
+    Abre um membro do .zip como fluxo descompactado. O fluxo recebe name e
+    size (tamanho descompactado), usados na detecção do formato e no progresso.
+    """
+    _rewind(source)
+    archive = zipfile.ZipFile(source)
+    stream = archive.open(member)
+    stream.name = member
+    stream.size = archive.getinfo(member).file_size
+    return stream
+
+
+def read_csv_chunks(source: Any, chunk_rows: int, **read_options) -> Iterator[pd.DataFrame]:
+    """Lê um CSV (caminho ou arquivo) em blocos de chunk_rows linhas"""
+    _rewind(source)
+    with pd.read_csv(source, chunksize=chunk_rows, **read_options) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def _parquet_chunks(source: Any, chunk_rows: int) -> Tuple[Iterator[pd.DataFrame], Optional[int]]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(_arrow_input(source))
+    batches = parquet_file.iter_batches(batch_size=chunk_rows)
+    return (batch.to_pandas() for batch in batches), parquet_file.metadata.num_rows
+
+
+def _arrow_chunks(source: Any, chunk_rows: int) -> Tuple[Iterator[pd.DataFrame], Optional[int]]:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    input_file = _arrow_input(source)
+    try:
+        table = ipc.open_file(input_file).read_all()
+    except pa.ArrowInvalid:
+        # Arrow IPC em formato stream (sem rodapé de arquivo)
+        input_file.seek(0)
+        table = ipc.open_stream(input_file).read_all()
+    return (batch.to_pandas() for batch in table.to_batches(max_chunksize=chunk_rows)), table.num_rows
+
+
+def _xlsx_chunks(source: Any, chunk_rows: int) -> Tuple[Iterator[pd.DataFrame], Optional[int]]:
+    from openpyxl import load_workbook
+
+    _rewind(source)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    sheet = workbook.worksheets[0]
+    total = (sheet.max_row - 1) if sheet.max_row else None
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        try:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(col) if col is not None else f"coluna_{i + 1}" for i, col in enumerate(header)]
+            buffer = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                buffer.append(row)
+                if len(buffer) >= chunk_rows:
+                    yield pd.DataFrame(buffer, columns=columns)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=columns)
+        finally:
+            workbook.close()
+
+    return chunks(), total
+
+
+def _jsonl_chunks(source: Any, chunk_rows: int) -> Tuple[Iterator[pd.DataFrame], Optional[int]]:
+    _rewind(source)
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        with pd.read_json(source, lines=True, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                yield chunk
+
+    return chunks(), None
+
+
+def iter_chunks(source: Any, file_format: str, chunk_rows: int,
+                compression: str = None) -> Tuple[Iterator[pd.DataFrame], Optional[int]]:
+    """
+    Blocos de até chunk_rows linhas e o total de linhas (quando o formato
+    informa no cabeçalho/metadados; None caso contrário)
+    """
+    if compression:
+        stream = open_decompressed(source, compression)
+        source = stream if file_format in STREAMING_FORMATS else _spool(stream)
+    if file_format == 'csv':
+        return read_csv_chunks(source, chunk_rows), None
+    if file_format == 'parquet':
+        return _parquet_chunks(source, chunk_rows)
+    if file_format == 'arrow':
+        return _arrow_chunks(source, chunk_rows)
+    if file_format == 'xlsx':
+        return _xlsx_chunks(source, chunk_rows)
+    if file_format == 'jsonl':
+        return _jsonl_chunks(source, chunk_rows)
+    raise ValueError(f"Formato de arquivo não suportado: {file_format}")
+
+
+def read_frame(source: Any, file_format: str = None) -> pd.DataFrame:
+    """Lê o arquivo inteiro em um DataFrame"""
+    name = getattr(source, 'name', source)
+    if is_archive(name):
+        members = archive_members(source)
+        if len(members) != 1:
+            raise ValueError(f"O arquivo .zip deve conter exatamente um arquivo de dados (encontrados: {len(members)})")
+        return read_frame(open_member(source, members[0]))
+    file_format = file_format or detect_format(name)
+    compression = detect_compression(name)
+    if file_format == 'csv' and not compression:
+        _rewind(source)
+        return pd.read_csv(source)
+    chunks, _ = iter_chunks(source, file_format, chunk_rows=1_000_000, compression=compression)
+    frames = list(chunks)
+    if not frames:
+        return pd.DataFrame()
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
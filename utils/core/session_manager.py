@@ -1,7 +1,9 @@
 import streamlit as st
+import pandas as pd
 # CORREÇÃO: Importar dos caminhos absolutos corretos
 from utils.vendas.data_manager import initialize_session_data
 from utils.leads.leads_manager import initialize_leads_data
+from utils.import_helpers import get_dataset_store
 
 class SessionManager:
     """Gerencia o estado da sessão e inicialização de dados"""
@@ -40,16 +42,17 @@ class SessionManager:
     def clear_category(category: str):
         """Limpa dados de uma categoria"""
         configs = SessionManager.get_table_configs()[category]
+        store = get_dataset_store()
         for config in configs:
-            st.session_state[config["data_key"]] = []
+            store.put(config["data_key"], pd.DataFrame())
     
     @staticmethod
     def restore_category(category: str):
         """Restaura dados de uma categoria"""
         configs = SessionManager.get_table_configs()[category]
+        store = get_dataset_store()
         for config in configs:
-            if config["data_key"] in st.session_state:
-                del st.session_state[config["data_key"]]
+            store.delete(config["data_key"])
         
         if category == 'vendas':
             initialize_session_data()
@@ -0,0 +1,151 @@
+"""
+Importação em blocos (CSV, Parquet, Feather, XLSX, JSON lines): leitura,
+sanitização e validação progressivas.
+
+O arquivo nunca é carregado inteiro em um único DataFrame bruto; cada bloco
+é validado assim que lido e apenas a versão sanitizada é mantida até a
+montagem final da tabela colunar.
+"""
+
+import os
+import pandas as pd
+from collections import deque
+from typing import Any, Callable, Optional
+
+from utils.core.dataset_store import ColumnarTable
+from utils.core.readers import detect_compression, detect_format, iter_chunks
+from utils.core.validation import DataValidator, ValidationStats, validate_rows
+
+DEFAULT_CHUNK_ROWS = 100_000
+PREVIEW_ROWS = 1_000
+
+
+class StreamingImportResult:
+    """Resultado de uma importação em blocos"""
+
+    def __init__(self, is_valid: bool, message: str, table: Optional[ColumnarTable],
+                 preview: pd.DataFrame, rows: int, chunks: int):
+        self.is_valid = is_valid
+        self.message = message
+        self.table = table
+        self.preview = preview
+        self.rows = rows
+        self.chunks = chunks
+
+
+def _source_size(source: Any) -> Optional[int]:
+    size = getattr(source, 'size', None)
+    if size is not None:
+        return size
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    return None
+
+
+def _apply_part(chunk: pd.DataFrame, part: tuple, stats: ValidationStats) -> pd.DataFrame:
+    """Aplica ao bloco o resultado validado em outro processo"""
+    part_stats, coerced = part
+    stats.merge(part_stats)
+    for col, values in coerced.items():
+        chunk[col] = values
+    return chunk
+
+
+def stream_import(source: Any, data_key: str, file_format: str = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  on_progress: Callable[[float, int], None] = None,
+                  preview_rows: int = PREVIEW_ROWS, workers: int = 1,
+                  stats: ValidationStats = None, on_read: Callable[[int], None] = None) -> StreamingImportResult:
+    """
+    Lê, sanitiza e valida o arquivo bloco a bloco. on_progress recebe a
+    fração lida (0-1, quando o tamanho é conhecido) e o total de linhas
+    validadas até o momento; on_read, o total de linhas lidas. Com
+    workers > 1 a validação dos blocos roda em um pool de processos
+    enquanto os próximos blocos são lidos. Os contadores podem ser
+    informados em stats para acompanhar os avisos durante a leitura.
+    """
+    validation = DataValidator.get_validation_info(data_key)
+    if stats is None and validation:
+        stats = ValidationStats(validation)
+    name = getattr(source, 'name', source)
+    file_format = file_format or detect_format(name)
+    # Com compactação, o progresso segue a posição no arquivo compactado
+    chunk_iter, total_rows = iter_chunks(source, file_format, chunk_rows, compression=detect_compression(name))
+    size = _source_size(source)
+    
+    def read_chunks():
+        rows_read = 0
+        for chunk in chunk_iter:
+            rows_read += len(chunk)
+            if on_read is not None:
+                on_read(rows_read)
+            yield chunk
+
+    chunks = []
+    preview = None
+    rows = 0
+    
+    def accept(chunk: pd.DataFrame):
+        nonlocal preview, rows
+        if preview is None:
+            preview = chunk.head(preview_rows).copy()
+        chunks.append(chunk)
+        rows += len(chunk)
+        if on_progress is not None:
+            if total_rows:
+                fraction = min(rows / total_rows, 1.0)
+            else:
+                position = source.tell() if hasattr(source, 'tell') else None
+                fraction = min(position / size, 1.0) if size and position is not None else 0.0
+            on_progress(fraction, rows)
+    
+    def invalid(chunk: pd.DataFrame) -> StreamingImportResult:
+        is_valid, message = stats.result()
+        return StreamingImportResult(is_valid, message, None, chunk.head(preview_rows), stats.rows, len(chunks) + 1)
+    
+    if stats is not None and workers > 1:
+        # Blocos validados no pool de processos, mantendo a ordem de leitura
+        plan = stats.plan
+        pending = deque()
+        executor = DataValidator._executor(workers)
+        try:
+            for chunk in read_chunks():
+                missing_columns = [col for col in validation["required_columns"] if col not in chunk.columns]
+                if missing_columns:
+                    stats.rows += len(chunk)
+                    stats.missing_columns = missing_columns
+                    return invalid(chunk)
+                columns = [col for col in plan.columns if col in chunk.columns]
+                pending.append((chunk, executor.submit(validate_rows, data_key, {}, 0, len(chunk), columns, chunk[columns])))
+                while len(pending) > workers * 2 or (pending and pending[0][1].done()):
+                    done_chunk, future = pending.popleft()
+                    accept(_apply_part(done_chunk, future.result(), stats))
+            while pending:
+                done_chunk, future = pending.popleft()
+                accept(_apply_part(done_chunk, future.result(), stats))
+        finally:
+            # O pool é compartilhado: blocos pendentes (cancelamento, arquivo inválido) são descartados
+            for _, future in pending:
+                future.cancel()
+    else:
+        for chunk in read_chunks():
+            if stats is not None:
+                chunk = DataValidator.validate_chunk(chunk, stats)
+                if stats.missing_columns:
+                    return invalid(chunk)
+            accept(chunk)
+    
+    if stats is not None:
+        is_valid, message = stats.result()
+    else:
+        is_valid, message = True, "Validação não configurada para este dataset"
+
+    chunk_count = len(chunks)
+    table = ColumnarTable.from_chunks(chunks)
+    if on_progress is not None:
+        on_progress(1.0, rows)
+    return StreamingImportResult(is_valid, message, table, preview if preview is not None else pd.DataFrame(), rows, chunk_count)
+
+
+def stream_csv_import(source: Any, data_key: str, **options) -> StreamingImportResult:
+    """Importação em blocos de um CSV (ver stream_import)"""
+    return stream_import(source, data_key, file_format='csv', **options)
@@ -4,45 +4,91 @@ Helpers para importação e manipulação de dados da sessão
 
 import streamlit as st
 import pandas as pd
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from utils.core.dataset_store import DatasetStore, ColumnarTable
+from utils.core.validation import DataValidator
+
+DATASET_STORE_KEY = '_dataset_store'
+
+def get_dataset_store() -> DatasetStore:
+    """
+    Obtém o armazenamento colunar de datasets da sessão
+    """
+    if DATASET_STORE_KEY not in st.session_state:
+        st.session_state[DATASET_STORE_KEY] = DatasetStore()
+    return st.session_state[DATASET_STORE_KEY]
 
 def get_session_df(data_key: str, default_columns: List[str] = None) -> pd.DataFrame:
     """
-    Obtém DataFrame do session_state ou cria um vazio
+    Obtém DataFrame (visão somente leitura) do armazenamento ou cria um vazio
     """
     try:
-        if data_key in st.session_state and st.session_state[data_key]:
-            data = st.session_state[data_key]
-            if isinstance(data, list):
-                return pd.DataFrame(data)
-            elif isinstance(data, pd.DataFrame):
-                return data.copy()
-            else:
-                return pd.DataFrame()
-        else:
-            if default_columns:
-                return pd.DataFrame(columns=default_columns)
-            return pd.DataFrame()
+        table = get_dataset_store().get_table(data_key)
+        if table is not None and len(table) > 0:
+            return table.to_frame()
+        if default_columns:
+            return pd.DataFrame(columns=default_columns)
+        return pd.DataFrame()
     except Exception as e:
         st.error(f"Erro ao carregar dados de {data_key}: {str(e)}")
         return pd.DataFrame(columns=default_columns or [])
 
+def get_session_fingerprint(data_key: str) -> str:
+    """
+    Obtém o fingerprint do conteúdo atual da tabela (chave de cache)
+    """
+    return get_dataset_store().fingerprint(data_key)
+
 def save_to_session(data_key: str, data: Any) -> None:
     """
-    Salva dados no session_state
+    Salva dados no armazenamento colunar (tabelas) ou no session_state
     """
     try:
-        if isinstance(data, pd.DataFrame):
-            st.session_state[data_key] = data.to_dict('records')
+        if isinstance(data, (pd.DataFrame, list, ColumnarTable)):
+            get_dataset_store().put(data_key, data)
         else:
             st.session_state[data_key] = data
     except Exception as e:
         st.error(f"Erro ao salvar dados em {data_key}: {str(e)}")
 
+def append_to_session(data_key: str, data: Any) -> None:
+    """
+    Adiciona linhas ao final de uma tabela do armazenamento colunar
+    """
+    try:
+        get_dataset_store().append(data_key, data)
+    except Exception as e:
+        st.error(f"Erro ao adicionar dados em {data_key}: {str(e)}")
+
+def upsert_to_session(data_key: str, data: Any) -> Tuple[int, int]:
+    """
+    Atualiza linhas existentes pela chave primária da tabela e insere as
+    novas. Retorna (inseridas, atualizadas)
+    """
+    key_columns = DataValidator.get_primary_key(data_key)
+    if not key_columns:
+        st.error(f"Tabela {data_key} não possui chave primária definida")
+        return 0, 0
+    try:
+        return get_dataset_store().upsert(data_key, data, key_columns)
+    except Exception as e:
+        st.error(f"Erro ao atualizar dados em {data_key}: {str(e)}")
+        return 0, 0
+
+def preview_upsert(data_key: str, data: Any) -> Tuple[int, int]:
+    """
+    Simula o upsert pela chave primária: (inseridas, atualizadas)
+    """
+    key_columns = DataValidator.get_primary_key(data_key)
+    if not key_columns:
+        return 0, 0
+    return get_dataset_store().upsert_counts(data_key, data, key_columns)
+
 def clear_session_data(data_key: str) -> None:
     """
-    Limpa dados específicos do session_state
+    Limpa dados específicos do armazenamento e do session_state
     """
+    get_dataset_store().delete(data_key)
     if data_key in st.session_state:
         del st.session_state[data_key]
 
@@ -1,6 +1,7 @@
 from .leads_manager import LeadsDataManager, initialize_leads_data, get_leads_dataframes, calculate_leads_kpis
 from .analytics import LeadsAnalytics
 from .charts import LeadsCharts
+from .scoring import LeadScoringEngine
 
 __all__ = [
     'LeadsDataManager',
@@ -8,5 +9,6 @@ __all__ = [
     'get_leads_dataframes', 
     'calculate_leads_kpis',
     'LeadsAnalytics',
-    'LeadsCharts'
+    'LeadsCharts',
+    'LeadScoringEngine'
 ]
\ No newline at end of file
@@ -2,10 +2,14 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Tuple
 
+from utils.core.cache import cached_analytics
+from utils.leads.scoring import DEFAULT_ENGINE
+
 class LeadsAnalytics:
     """Análises avançadas para dados de leads"""
     
     @staticmethod
+    @cached_analytics
     def analyze_demographic_profile(dfs: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
         """Analisa o perfil demográfico completo dos leads"""
         if any(df.empty for df in dfs.values()):
@@ -102,6 +106,7 @@ class LeadsAnalytics:
         return insights
     
     @staticmethod
+    @cached_analytics
     def analyze_vehicle_preferences(dfs: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
         """Analisa preferências de veículos dos leads"""
         if any(df.empty for df in [dfs.get('classificacao_veiculo'), dfs.get('idade_veiculo'), dfs.get('veiculos_visitados')]):
@@ -200,48 +205,22 @@ class LeadsAnalytics:
         return recomendacoes
     
     @staticmethod
+    @cached_analytics
     def calculate_conversion_potential(dfs: Dict[str, pd.DataFrame]) -> Dict[str, float]:
         """Calcula potencial de conversão por segmento"""
         if any(df.empty for df in dfs.values()):
             return {}
             
-        # Fatores de conversão (baseados em benchmarks do setor)
-        fatores_conversao = {
-            'genero': {'mulheres': 1.1, 'homens': 1.0},  # Mulheres convertem 10% melhor
-            'faixa_etaria': {'20-40': 1.2, '40-60': 1.0, '60-80': 0.8, '0-20': 0.6, '80+': 0.4},
-            'faixa_salarial': {'5000-10000': 1.1, '10000-15000': 1.3, '15000-20000': 1.5, '20000+': 1.7, '0-5000': 0.7},
-            'status_profissional': {'clt': 1.2, 'empresário(a)': 1.4, 'autônomo(a)': 1.1, 'funcionário(a) público(a)': 1.3, 'freelancer': 1.0, 'aposentado(a)': 0.9, 'estudante': 0.6, 'outro': 0.8}
-        }
-        
-        # Calcular score médio de conversão
-        scores = []
-        
-        # Score por gênero
-        for _, row in dfs['genero'].iterrows():
-            score = row['leads'] * fatores_conversao['genero'].get(row['genero'], 1.0)
-            scores.append(score)
-        
-        # Score por faixa etária
-        for _, row in dfs['faixa_etaria'].iterrows():
-            score = row['leads_percent'] * fatores_conversao['faixa_etaria'].get(row['faixa'], 1.0)
-            scores.append(score)
-        
-        # Score por faixa salarial
-        for _, row in dfs['faixa_salarial'].iterrows():
-            score = row['leads_percent'] * fatores_conversao['faixa_salarial'].get(row['faixa'], 1.0)
-            scores.append(score)
-        
-        # Score por status profissional
-        for _, row in dfs['status_profissional'].iterrows():
-            score = row['leads_percent'] * fatores_conversao['status_profissional'].get(row['status'], 1.0)
-            scores.append(score)
+        # Score (peso x fator de conversão) de todos os segmentos em uma passada vetorizada
+        scores = DEFAULT_ENGINE.score_segments(dfs)
         
-        potencial_medio = np.mean(scores) if scores else 0
-        potencial_maximo = max(scores) if scores else 0
+        potencial_medio = float(scores['score'].mean()) if len(scores) else 0
+        potencial_maximo = float(scores['score'].max()) if len(scores) else 0
         
         return {
             'potencial_conversao_medio': potencial_medio,
             'potencial_conversao_maximo': potencial_maximo,
             'segmento_alto_potencial': 'Identificar baseado na análise',
-            'recomendacao_priorizacao': 'Focar em segmentos com score acima da média'
+            'recomendacao_priorizacao': 'Focar em segmentos com score acima da média',
+            'scores_segmentos': scores.to_dict('records')
         }
\ No newline at end of file
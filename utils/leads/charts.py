@@ -4,6 +4,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from typing import Dict, List, Optional, Any
 
+from utils.core.cache import cached_figure
+
 class LeadsCharts:
     """Gráficos profissionais e intuitivos para análise de LEADS"""
     
@@ -28,6 +30,7 @@ class LeadsCharts:
     VEHICLE_COLORS = ['#2E86AB', '#A23B72']  # Novo vs Seminovo
     
     @staticmethod
+    @cached_figure
     def create_gender_distribution(df_genero: pd.DataFrame):
         """Cria gráfico de distribuição por gênero - MELHORADO"""
         if df_genero.empty:
@@ -69,6 +72,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_professional_status(df_status: pd.DataFrame):
         """Cria gráfico de status profissional - MELHORADO"""
         if df_status.empty:
@@ -106,6 +110,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_age_distribution(df_faixa_etaria: pd.DataFrame):
         """Cria gráfico de distribuição por faixa etária - MELHORADO"""
         if df_faixa_etaria.empty:
@@ -144,6 +149,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_salary_distribution(df_faixa_salarial: pd.DataFrame):
         """Cria gráfico de distribuição por faixa salarial - MELHORADO"""
         if df_faixa_salarial.empty:
@@ -182,6 +188,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_vehicle_classification(df_classificacao: pd.DataFrame):
         """Cria gráfico de classificação de veículos - MELHORADO"""
         if df_classificacao.empty:
@@ -239,6 +246,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_vehicle_age_distribution(df_idade_veiculo: pd.DataFrame):
         """Cria gráfico de distribuição por idade do veículo - MELHORADO"""
         if df_idade_veiculo.empty:
@@ -277,6 +285,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_top_vehicles(df_veiculos: pd.DataFrame):
         """Cria gráfico dos veículos mais visitados - MELHORADO"""
         if df_veiculos.empty:
@@ -315,6 +324,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_demographic_dashboard(dfs: Dict[str, pd.DataFrame]):
         """Cria dashboard demográfico completo - NOVO"""
         if any(df.empty for df in dfs.values()):
@@ -413,6 +423,7 @@ class LeadsCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_demographic_dashboard(dfs: Dict[str, pd.DataFrame]):
         """Cria dashboard demográfico simplificado"""
         # Verificar dados necessários
@@ -476,6 +487,7 @@ class LeadsCharts:
         return fig
 
     @staticmethod
+    @cached_figure
     def create_vehicle_preference_dashboard(dfs: Dict[str, pd.DataFrame]):
         """Cria dashboard de veículos simplificado"""
         # Verificar dados necessários
@@ -539,6 +551,7 @@ class LeadsCharts:
         return fig
 
     @staticmethod
+    @cached_figure
     def create_vehicle_preference_dashboard(dfs: Dict[str, pd.DataFrame]):
         """Cria dashboard de preferências de veículos - NOVO"""
         if any(df.empty for df in [dfs.get('classificacao_veiculo'), dfs.get('idade_veiculo'), dfs.get('veiculos_visitados')]):
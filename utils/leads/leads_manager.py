@@ -1,6 +1,15 @@
 import pandas as pd
-import streamlit as st
 from typing import Dict, List, Any
+from utils.core.dataset_store import DatasetStore
+from utils.core.data_sources import DataSource, MemoryDataSource, get_configured_source, load_with_fallback
+from utils.core.kpis import KpiAccumulator
+
+
+def _session_store() -> DatasetStore:
+    # Importado sob demanda: o módulo também é usado sem Streamlit (python -m utils.cli)
+    from utils.import_helpers import get_dataset_store
+    return get_dataset_store()
+
 
 class LeadsDataManager:
     """Gerenciador específico para dados de leads"""
@@ -91,30 +100,59 @@ class LeadsDataManager:
         'dados_veiculos_visitados': DEFAULT_VEICULOS_VISITADOS_DATA
     }
 
+    KPI_GENERO = KpiAccumulator('dados_genero', sum_columns=['leads'], group_column='genero', group_sum_column='leads')
+    KPI_CLASSIFICACAO = KpiAccumulator('dados_classificacao_veiculo', sum_columns=['visitas'])
+    KPI_VEICULOS = KpiAccumulator('dados_veiculos_visitados', max_column='visitas')
+
+    TABLE_KEYS = {
+        'genero': 'dados_genero',
+        'status_profissional': 'dados_status_profissional',
+        'faixa_etaria': 'dados_faixa_etaria',
+        'faixa_salarial': 'dados_faixa_salarial',
+        'classificacao_veiculo': 'dados_classificacao_veiculo',
+        'idade_veiculo': 'dados_idade_veiculo',
+        'veiculos_visitados': 'dados_veiculos_visitados'
+    }
+
+    @staticmethod
+    def get_data_source() -> DataSource:
+        """Fonte de dados ativa: banco configurado (DATABASE_URL) ou dados padrão"""
+        return get_configured_source() or MemoryDataSource(LeadsDataManager.DATA_MAPPINGS)
+
     @staticmethod
     def initialize_leads_data():
-        """Inicializa dados de leads na session_state"""
+        """Inicializa dados de leads (base compartilhada do processo)"""
+        store = _session_store()
+        source = None
         for data_key, default_data in LeadsDataManager.DATA_MAPPINGS.items():
-            if data_key not in st.session_state:
-                st.session_state[data_key] = default_data
+            if data_key in store.base:
+                continue
+            # Cópia única por processo; a sessão só guarda suas próprias alterações
+            source = source or LeadsDataManager.get_data_source()
+            store.base.register(data_key, load_with_fallback(source, data_key, default_data))
 
     @staticmethod
-    def get_leads_dataframes() -> Dict[str, pd.DataFrame]:
-        """Retorna todos os dados de leads como DataFrames"""
-        return {
-            'genero': pd.DataFrame(st.session_state.dados_genero),
-            'status_profissional': pd.DataFrame(st.session_state.dados_status_profissional),
-            'faixa_etaria': pd.DataFrame(st.session_state.dados_faixa_etaria),
-            'faixa_salarial': pd.DataFrame(st.session_state.dados_faixa_salarial),
-            'classificacao_veiculo': pd.DataFrame(st.session_state.dados_classificacao_veiculo),
-            'idade_veiculo': pd.DataFrame(st.session_state.dados_idade_veiculo),
-            'veiculos_visitados': pd.DataFrame(st.session_state.dados_veiculos_visitados)
-        }
+    def get_leads_dataframes(source: DataSource = None, store: DatasetStore = None) -> Dict[str, pd.DataFrame]:
+        """
+        Retorna todos os dados de leads como DataFrames (visões somente leitura).
+        Se uma fonte for informada, os dados são lidos diretamente dela; sem
+        store, usa o da sessão.
+        """
+        if source is not None:
+            loaded = source.load_many(LeadsDataManager.TABLE_KEYS.values())
+            return {
+                name: loaded[data_key] if loaded[data_key] is not None else pd.DataFrame()
+                for name, data_key in LeadsDataManager.TABLE_KEYS.items()
+            }
+        
+        store = store if store is not None else _session_store()
+        return {name: store.get_frame(data_key) for name, data_key in LeadsDataManager.TABLE_KEYS.items()}
 
     @staticmethod
-    def calculate_leads_kpis() -> Dict[str, Any]:
-        """Calcula KPIs específicos de leads"""
-        if 'dados_genero' not in st.session_state or 'dados_classificacao_veiculo' not in st.session_state:
+    def calculate_leads_kpis(store: DatasetStore = None) -> Dict[str, Any]:
+        """Calcula KPIs específicos de leads (store da sessão por padrão)"""
+        store = store if store is not None else _session_store()
+        if 'dados_genero' not in store or 'dados_classificacao_veiculo' not in store:
             return {
                 'total_leads': 0,
                 'total_visitas': 0,
@@ -126,15 +164,28 @@ class LeadsDataManager:
                 'visitas_veiculo_top': 0
             }
             
-        total_leads = sum(item['leads'] for item in st.session_state.dados_genero)
-        total_visitas = sum(item['visitas'] for item in st.session_state.dados_classificacao_veiculo)
+        # Incremental: em "Adicionar Linhas" só as linhas novas são processadas
+        genero = LeadsDataManager.KPI_GENERO.compute(store.get_table('dados_genero'))
+        classificacao = LeadsDataManager.KPI_CLASSIFICACAO.compute(store.get_table('dados_classificacao_veiculo'))
+        
+        total_leads = genero.sums['leads']
+        total_visitas = classificacao.sums['visitas']
         
         # Encontrar veículo mais visitado
-        veiculo_mais_visitado = max(st.session_state.dados_veiculos_visitados, key=lambda x: x['visitas'])
+        table_veiculos = store.get_table('dados_veiculos_visitados')
+        veiculos = LeadsDataManager.KPI_VEICULOS.compute(table_veiculos) if table_veiculos is not None else None
+        if veiculos is not None and veiculos.max_index is not None:
+            marca = KpiAccumulator.row_value(table_veiculos, veiculos.max_index, 'marca', '')
+            modelo = KpiAccumulator.row_value(table_veiculos, veiculos.max_index, 'modelo', '')
+            nome_veiculo = f"{marca} {modelo}"
+            visitas_veiculo_top = veiculos.max_value
+        else:
+            nome_veiculo = 'N/A'
+            visitas_veiculo_top = 0
         
         # Calcular distribuição por gênero
-        mulheres = next(item for item in st.session_state.dados_genero if item['genero'] == 'mulheres')['leads']
-        homens = next(item for item in st.session_state.dados_genero if item['genero'] == 'homens')['leads']
+        mulheres = genero.group_sums.get('mulheres', 0)
+        homens = genero.group_sums.get('homens', 0)
         percent_mulheres = (mulheres / total_leads * 100) if total_leads > 0 else 0
         percent_homens = (homens / total_leads * 100) if total_leads > 0 else 0
         
@@ -145,8 +196,8 @@ class LeadsDataManager:
             'homens': homens,
             'percent_mulheres': percent_mulheres,
             'percent_homens': percent_homens,
-            'veiculo_mais_visitado': f"{veiculo_mais_visitado['marca']} {veiculo_mais_visitado['modelo']}",
-            'visitas_veiculo_top': veiculo_mais_visitado['visitas']
+            'veiculo_mais_visitado': nome_veiculo,
+            'visitas_veiculo_top': visitas_veiculo_top
         }
 
     @staticmethod
@@ -0,0 +1,104 @@
+"""
+Score de conversão vetorizado.
+
+Os fatores de cada dimensão (gênero, faixa etária, ...) são guardados como
+um índice de categorias e um array de fatores alinhado a ele. Os valores
+de segmentos ou de leads individuais viram códigos categóricos e o fator
+é obtido por indexação do array (código -> fator), sem laço por linha.
+Valores fora da tabela de fatores (código -1) recebem o fator neutro.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+# Fatores de conversão (baseados em benchmarks do setor)
+CONVERSION_FACTORS = {
+    'genero': {'mulheres': 1.1, 'homens': 1.0},  # Mulheres convertem 10% melhor
+    'faixa_etaria': {'20-40': 1.2, '40-60': 1.0, '60-80': 0.8, '0-20': 0.6, '80+': 0.4},
+    'faixa_salarial': {'5000-10000': 1.1, '10000-15000': 1.3, '15000-20000': 1.5, '20000+': 1.7, '0-5000': 0.7},
+    'status_profissional': {'clt': 1.2, 'empresário(a)': 1.4, 'autônomo(a)': 1.1, 'funcionário(a) público(a)': 1.3, 'freelancer': 1.0, 'aposentado(a)': 0.9, 'estudante': 0.6, 'outro': 0.8}
+}
+NEUTRAL_FACTOR = 1.0
+
+# Tabelas agregadas de leads: dimensão -> (coluna do segmento, coluna de peso)
+SEGMENT_COLUMNS = {
+    'genero': ('genero', 'leads'),
+    'faixa_etaria': ('faixa', 'leads_percent'),
+    'faixa_salarial': ('faixa', 'leads_percent'),
+    'status_profissional': ('status', 'leads_percent')
+}
+
+SEGMENT_SCORE_COLUMNS = ['dimensao', 'segmento', 'peso', 'fator', 'score']
+
+
+class LeadScoringEngine:
+    """Aplica os fatores de conversão a segmentos agregados ou a leads individuais"""
+
+    def __init__(self, factors: Dict[str, Dict[str, float]] = None, default: float = NEUTRAL_FACTOR):
+        factors = factors if factors is not None else CONVERSION_FACTORS
+        self.default = default
+        self._categories = {dimension: pd.Index(list(values)) for dimension, values in factors.items()}
+        # Última posição = fator neutro, alcançada pelos códigos -1 (valores desconhecidos/nulos)
+        self._factors = {
+            dimension: np.append(np.asarray(list(values.values()), dtype='float64'), default)
+            for dimension, values in factors.items()
+        }
+
+    @property
+    def dimensions(self) -> List[str]:
+        return list(self._categories)
+
+    def codes(self, dimension: str, values: Any) -> np.ndarray:
+        """Código de cada valor no índice de fatores da dimensão (-1 = sem fator)"""
+        categories = self._categories[dimension]
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            # Colunas já categóricas: uma busca por categoria e depois apenas indexação dos códigos
+            series = pd.Series(values)
+            positions = np.append(categories.get_indexer(series.cat.categories), -1)
+            return positions[series.cat.codes.to_numpy()]
+        return pd.Categorical(values, categories=categories).codes.astype(np.intp)
+
+    def factors(self, dimension: str, values: Any) -> np.ndarray:
+        """Fator de conversão de cada valor (fator neutro para dimensões ou valores sem fator)"""
+        if dimension not in self._factors:
+            return np.full(len(values), self.default)
+        return self._factors[dimension][self.codes(dimension, values)]
+
+    def score_segments(self, dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Score (peso x fator) de cada segmento das tabelas agregadas, na ordem
+        gênero, faixa etária, faixa salarial e status profissional.
+        """
+        parts = []
+        for dimension, (segment_column, weight_column) in SEGMENT_COLUMNS.items():
+            df = dfs.get(dimension)
+            if df is None or df.empty:
+                continue
+            weights = pd.to_numeric(df[weight_column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            factors = self.factors(dimension, df[segment_column])
+            parts.append(pd.DataFrame({
+                'dimensao': dimension,
+                'segmento': df[segment_column].astype(str).to_numpy(),
+                'peso': weights,
+                'fator': factors,
+                'score': weights * factors
+            }))
+        if not parts:
+            return pd.DataFrame(columns=SEGMENT_SCORE_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    def score_leads(self, leads: pd.DataFrame, columns: Dict[str, str] = None) -> pd.Series:
+        """
+        Score de cada lead: produto dos fatores das dimensões presentes.
+        columns mapeia dimensão -> coluna do DataFrame (padrão: mesmo nome).
+        """
+        columns = columns or {dimension: dimension for dimension in self.dimensions}
+        score = np.full(len(leads), 1.0)
+        for dimension, column in columns.items():
+            if column in leads.columns:
+                score *= self.factors(dimension, leads[column])
+        return pd.Series(score, index=leads.index, name='score')
+
+
+DEFAULT_ENGINE = LeadScoringEngine()
@@ -0,0 +1,266 @@
+"""
+Relatórios estáticos (HTML + métricas em JSON) sem Streamlit.
+
+As tabelas são carregadas em um DatasetStore próprio (dados padrão, banco
+ou pasta de extrações) e passam pelos mesmos KPIs, análises e fábricas de
+figuras das páginas. O HTML é autocontido: o plotly.js é embutido uma
+única vez e cada figura é apenas um <div> com seus dados.
+"""
+
+import html
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.core.data_sources import SQLDataSource, load_with_fallback
+from utils.core.dataset_store import DatasetStore, SharedDatasets
+from utils.core.ingest import INGESTED, ingest_directory
+from utils.leads.analytics import LeadsAnalytics
+from utils.leads.charts import LeadsCharts
+from utils.leads.leads_manager import LeadsDataManager
+from utils.vendas.analytics import VendasAnalytics
+from utils.vendas.charts import VendasCharts
+from utils.vendas.data_manager import VendasDataManager
+
+logger = logging.getLogger(__name__)
+
+# (seção, título, fábrica, tabela de entrada; None = todas as tabelas do domínio)
+VENDAS_FIGURES = [
+    ('Vendas', 'Performance mensal', VendasCharts.create_monthly_performance, 'mensal'),
+    ('Vendas', 'Taxa de conversão', VendasCharts.create_conversion_trend, 'mensal'),
+    ('Vendas', 'Ticket médio', VendasCharts.create_ticket_medio_chart, 'mensal'),
+    ('Vendas', 'Mapa de vendas', VendasCharts.create_brazil_map, 'estados'),
+    ('Vendas', 'Vendas por estado', VendasCharts.create_states_bar_chart, 'estados'),
+    ('Vendas', 'Vendas por região', VendasCharts.create_regions_pie_chart, 'estados'),
+    ('Vendas', 'Marcas', VendasCharts.create_brands_analysis, 'marcas'),
+    ('Vendas', 'Categorias', VendasCharts.create_category_pie_chart, 'marcas'),
+    ('Vendas', 'Ranking de lojas', VendasCharts.create_stores_ranking, 'lojas'),
+    ('Vendas', 'Visitas por dia da semana', VendasCharts.create_visits_trend, 'visitas')
+]
+
+LEADS_FIGURES = [
+    ('Leads', 'Gênero', LeadsCharts.create_gender_distribution, 'genero'),
+    ('Leads', 'Status profissional', LeadsCharts.create_professional_status, 'status_profissional'),
+    ('Leads', 'Faixa etária', LeadsCharts.create_age_distribution, 'faixa_etaria'),
+    ('Leads', 'Faixa salarial', LeadsCharts.create_salary_distribution, 'faixa_salarial'),
+    ('Leads', 'Classificação dos veículos', LeadsCharts.create_vehicle_classification, 'classificacao_veiculo'),
+    ('Leads', 'Idade dos veículos', LeadsCharts.create_vehicle_age_distribution, 'idade_veiculo'),
+    ('Leads', 'Veículos mais visitados', LeadsCharts.create_top_vehicles, 'veiculos_visitados'),
+    ('Leads', 'Painel demográfico', LeadsCharts.create_demographic_dashboard, None),
+    ('Leads', 'Preferências de veículos', LeadsCharts.create_vehicle_preference_dashboard, None)
+]
+
+DEFAULT_DATA = {**VendasDataManager.DATA_MAPPINGS, **LeadsDataManager.DATA_MAPPINGS}
+
+
+def mask_source(source: str) -> str:
+    """Fonte para exibição: URLs de banco com a senha mascarada (os relatórios são compartilhados)"""
+    if "://" not in source:
+        return source
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.exc import ArgumentError
+
+    try:
+        return make_url(source).render_as_string(hide_password=True)
+    except ArgumentError:
+        # URL inválida: descarta as credenciais antes do @
+        scheme, rest = source.split("://", 1)
+        return f"{scheme}://{rest.rsplit('@', 1)[-1]}"
+
+
+def load_store(source: str = None, schema: str = None) -> Tuple[DatasetStore, List[str]]:
+    """
+    Carrega as tabelas em um DatasetStore isolado. source pode ser uma pasta
+    de extrações (mesma regra de nomes e validação da importação por pasta),
+    uma URL de banco (agregações no banco; erros de conexão ou de consulta
+    são propagados) ou None (fonte configurada no ambiente, com os dados
+    padrão em caso de falha). Retorna o store e os avisos do carregamento.
+    """
+    datasets = SharedDatasets()
+    messages = []
+    if source is not None and os.path.isdir(source):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = ingest_directory(source, datasets=datasets,
+                                       manifest_path=os.path.join(temp_dir, "manifesto.json"))
+        messages.extend(
+            f"{result.path}: {result.status}" + (f" ({result.message})" if result.message else "")
+            for result in results if result.status != INGESTED
+        )
+    elif source:
+        # Fonte informada explicitamente: falhas interrompem o relatório (sem cair nos dados padrão)
+        loaded = SQLDataSource(source, schema=schema).load_many(DEFAULT_DATA)
+        for data_key, default_data in DEFAULT_DATA.items():
+            if loaded[data_key] is None:
+                messages.append(f"{data_key}: não fornecida pela fonte (dados padrão)")
+            datasets.register(data_key, default_data if loaded[data_key] is None else loaded[data_key])
+    else:
+        data_source = VendasDataManager.get_data_source()
+        for data_key, default_data in DEFAULT_DATA.items():
+            datasets.register(data_key, load_with_fallback(data_source, data_key, default_data))
+    return DatasetStore(datasets), messages
+
+
+def _run(errors: List[str], label: str, func: Callable, *args) -> Any:
+    """Executa uma análise/figura; falhas são registradas sem interromper o relatório"""
+    try:
+        return func(*args)
+    except Exception as e:
+        logger.warning("Falha em %s: %s", label, e)
+        errors.append(f"{label}: {e}")
+        return None
+
+
+def collect_metrics(store: DatasetStore, errors: List[str]) -> Dict[str, Any]:
+    """KPIs e análises de vendas e leads"""
+    vendas = VendasDataManager.get_dataframes(store=store)
+    leads = LeadsDataManager.get_leads_dataframes(store=store)
+    return {
+        'tabelas': {data_key: len(store.get_table(data_key)) for data_key in store.keys()},
+        'kpis': {
+            'vendas': _run(errors, 'KPIs de vendas', VendasDataManager.calculate_kpis, store),
+            'leads': _run(errors, 'KPIs de leads', LeadsDataManager.calculate_leads_kpis, store)
+        },
+        'vendas': {
+            'tendencias_mensais': _run(errors, 'Tendências mensais', VendasAnalytics.analyze_monthly_trends, vendas['mensal']),
+            'desempenho_geografico': _run(errors, 'Desempenho geográfico', VendasAnalytics.analyze_geographic_performance, vendas['estados']),
+            'marcas': _run(errors, 'Marcas', VendasAnalytics.analyze_brand_performance, vendas['marcas']),
+            'lojas': _run(errors, 'Lojas', VendasAnalytics.analyze_store_performance, vendas['lojas']),
+            'visitas': _run(errors, 'Visitas', VendasAnalytics.analyze_visits_patterns, vendas['visitas']),
+            'roi': _run(errors, 'ROI', VendasAnalytics.calculate_roi_metrics, vendas['mensal'])
+        },
+        'leads': {
+            'perfil_demografico': _run(errors, 'Perfil demográfico', LeadsAnalytics.analyze_demographic_profile, leads),
+            'preferencias_veiculos': _run(errors, 'Preferências de veículos', LeadsAnalytics.analyze_vehicle_preferences, leads),
+            'potencial_conversao': _run(errors, 'Potencial de conversão', LeadsAnalytics.calculate_conversion_potential, leads)
+        }
+    }
+
+
+def build_figures(store: DatasetStore, errors: List[str]) -> List[Tuple[str, str, Any]]:
+    """Figuras das páginas de gráficos: (seção, título, figura)"""
+    inputs = {
+        'Vendas': VendasDataManager.get_dataframes(store=store),
+        'Leads': LeadsDataManager.get_leads_dataframes(store=store)
+    }
+    figures = []
+    for section, title, factory, table in VENDAS_FIGURES + LEADS_FIGURES:
+        dfs = inputs[section]
+        figure = _run(errors, f"Gráfico '{title}'", factory, dfs if table is None else dfs[table])
+        if figure is not None and len(figure.data) > 0:
+            figures.append((section, title, figure))
+    return figures
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict('records')
+    if isinstance(value, pd.Series):
+        return value.to_dict()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"Valor não serializável: {type(value).__name__}")
+
+
+def metrics_json(report: Dict[str, Any]) -> str:
+    return json.dumps(report, default=_json_default, ensure_ascii=False, indent=2)
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, (float, np.floating)):
+        return f"{value:,.2f}"
+    if isinstance(value, (int, np.integer)):
+        return f"{value:,}"
+    return html.escape(str(value))
+
+
+_STYLE = """
+body { font-family: -apple-system, Segoe UI, Roboto, sans-serif; margin: 2rem; color: #262730; }
+h1 { margin-bottom: 0; } .sub { color: #6c757d; margin-top: .25rem; }
+.kpis { display: flex; flex-wrap: wrap; gap: 1rem; margin: 1rem 0 2rem; }
+.kpi { border: 1px solid #e6e6e6; border-radius: 8px; padding: .75rem 1rem; min-width: 160px; }
+.kpi span { display: block; color: #6c757d; font-size: .85rem; } .kpi b { font-size: 1.35rem; }
+.figure { margin-bottom: 2rem; } .errors { color: #b00020; }
+"""
+
+
+def render_html(title: str, report: Dict[str, Any], figures: List[Tuple[str, str, Any]]) -> str:
+    """Página HTML única com KPIs, avisos e figuras (plotly.js embutido uma vez)"""
+    parts = [
+        "<!DOCTYPE html>", "<html lang=\"pt-BR\"><head><meta charset=\"utf-8\">",
+        f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head><body>",
+        f"<h1>{html.escape(title)}</h1>",
+        f"<p class=\"sub\">Gerado em {html.escape(report['gerado_em'])} · fonte: {html.escape(report['fonte'])}</p>"
+    ]
+    for domain, kpis in report['metricas']['kpis'].items():
+        if not kpis:
+            continue
+        parts.append(f"<h2>KPIs de {html.escape(domain)}</h2><div class=\"kpis\">")
+        parts.extend(
+            f"<div class=\"kpi\"><span>{html.escape(name.replace('_', ' '))}</span><b>{_format_value(value)}</b></div>"
+            for name, value in kpis.items()
+        )
+        parts.append("</div>")
+    if report['avisos']:
+        parts.append("<h2>Avisos</h2><ul class=\"errors\">")
+        parts.extend(f"<li>{html.escape(message)}</li>" for message in report['avisos'])
+        parts.append("</ul>")
+
+    include_plotlyjs = True
+    current_section = None
+    for section, title_figure, figure in figures:
+        if section != current_section:
+            parts.append(f"<h2>{html.escape(section)}</h2>")
+            current_section = section
+        parts.append(f"<div class=\"figure\"><h3>{html.escape(title_figure)}</h3>")
+        parts.append(figure.to_html(full_html=False, include_plotlyjs=include_plotlyjs))
+        parts.append("</div>")
+        include_plotlyjs = False
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def generate_report(name: str, output_dir: str, source: str = None, schema: str = None) -> Dict[str, Any]:
+    """
+    Gera <output_dir>/<name>.html e <name>.json. Retorna um resumo
+    (arquivos, tabelas, figuras, avisos e tempo).
+    """
+    started = time.time()
+    store, messages = load_store(source, schema)
+    errors = list(messages)
+    report = {
+        'relatorio': name,
+        'fonte': mask_source(source) if source else 'dados padrão',
+        'gerado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metricas': collect_metrics(store, errors)
+    }
+    figures = build_figures(store, errors)
+    report['avisos'] = errors
+
+    os.makedirs(output_dir, exist_ok=True)
+    html_path = os.path.join(output_dir, f"{name}.html")
+    json_path = os.path.join(output_dir, f"{name}.json")
+    with open(html_path, "w", encoding="utf-8") as handle:
+        handle.write(render_html(f"Relatório — {name}", report, figures))
+    with open(json_path, "w", encoding="utf-8") as handle:
+        handle.write(metrics_json(report))
+    return {
+        'relatorio': name,
+        'html': html_path,
+        'json': json_path,
+        'tabelas': len(report['metricas']['tabelas']),
+        'figuras': len(figures),
+        'avisos': len(errors),
+        'segundos': round(time.time() - started, 2)
+    }
@@ -1,6 +1,7 @@
 from .data_manager import VendasDataManager, initialize_session_data, get_dataframes, calculate_kpis
 from .analytics import VendasAnalytics
 from .charts import VendasCharts
+from .trends import TrendEngine
 
 __all__ = [
     'VendasDataManager',
@@ -8,5 +9,6 @@ __all__ = [
     'get_dataframes', 
     'calculate_kpis',
     'VendasAnalytics',
-    'VendasCharts'
+    'VendasCharts',
+    'TrendEngine'
 ]
\ No newline at end of file
@@ -2,32 +2,30 @@ import pandas as pd
 from typing import Dict, List, Tuple, Any
 import numpy as np
 
+from utils.core.cache import cached_analytics
+from utils.vendas.trends import batch_slopes, extreme_periods, rolling_means
+
 class VendasAnalytics:
     """Análises avançadas para dados de vendas"""
     
     @staticmethod
+    @cached_analytics
     def analyze_monthly_trends(df_mensal: pd.DataFrame) -> Dict[str, Any]:
         """Analisa tendências mensais"""
         if df_mensal.empty:
             return {}
             
-        df = df_mensal.copy()
-        df['mes_num'] = range(len(df))
-        
-        # Calcular tendências
-        tendencia_receita = np.polyfit(df['mes_num'], df['receita'], 1)[0]
-        tendencia_vendas = np.polyfit(df['mes_num'], df['vendas'], 1)[0]
-        tendencia_conversao = np.polyfit(df['mes_num'], df['conversao'], 1)[0]
-        
-        # Calcular médias móveis
-        df['receita_mm'] = df['receita'].rolling(window=3, min_periods=1).mean()
-        df['vendas_mm'] = df['vendas'].rolling(window=3, min_periods=1).mean()
+        # Inclinações das três séries em um único ajuste e médias móveis por soma acumulada
+        series = df_mensal[['receita', 'vendas', 'conversao']].to_numpy(dtype='float64').T
+        tendencia_receita, tendencia_vendas, tendencia_conversao = batch_slopes(series)
+        receita_mm, vendas_mm = rolling_means(series[:2], window=3)
         
         # Identificar melhores e piores meses
-        melhor_mes_receita = df.loc[df['receita'].idxmax()]
-        pior_mes_receita = df.loc[df['receita'].idxmin()]
-        melhor_mes_vendas = df.loc[df['vendas'].idxmax()]
-        pior_mes_vendas = df.loc[df['vendas'].idxmin()]
+        (melhor_receita, melhor_vendas, _), (pior_receita, pior_vendas, _) = extreme_periods(series)
+        melhor_mes_receita = df_mensal.iloc[melhor_receita]
+        pior_mes_receita = df_mensal.iloc[pior_receita]
+        melhor_mes_vendas = df_mensal.iloc[melhor_vendas]
+        pior_mes_vendas = df_mensal.iloc[pior_vendas]
         
         return {
             'tendencia_receita': tendencia_receita,
@@ -49,17 +47,23 @@ class VendasAnalytics:
                 'mes': pior_mes_vendas['mes'],
                 'vendas': pior_mes_vendas['vendas']
             },
-            'dados_tendencias': df[['mes', 'receita_mm', 'vendas_mm']].to_dict('records')
+            'dados_tendencias': pd.DataFrame({
+                'mes': df_mensal['mes'].to_numpy(),
+                'receita_mm': receita_mm,
+                'vendas_mm': vendas_mm
+            }).to_dict('records')
         }
     
     @staticmethod
+    @cached_analytics
     def analyze_geographic_performance(df_estados: pd.DataFrame) -> Dict[str, Any]:
         """Analisa performance geográfica"""
         if df_estados.empty:
             return {}
             
         total_vendas = df_estados['vendas'].sum()
-        df_estados['participacao'] = (df_estados['vendas'] / total_vendas) * 100
+        # Colunas derivadas em cópia local: a entrada pode ser compartilhada
+        df_estados = df_estados.assign(participacao=(df_estados['vendas'] / total_vendas) * 100)
         
         # Análise por região
         vendas_por_regiao = df_estados.groupby('regiao')['vendas'].agg(['sum', 'count']).reset_index()
@@ -67,7 +71,7 @@ class VendasAnalytics:
         
         # Estados com maior potencial (baixa participação mas alta performance relativa)
         media_vendas_por_estado = df_estados['vendas'].mean()
-        df_estados['performance_relativa'] = df_estados['vendas'] / media_vendas_por_estado
+        df_estados = df_estados.assign(performance_relativa=df_estados['vendas'] / media_vendas_por_estado)
         
         return {
             'total_estados': len(df_estados),
@@ -78,13 +82,15 @@ class VendasAnalytics:
         }
     
     @staticmethod
+    @cached_analytics
     def analyze_brand_performance(df_marcas: pd.DataFrame) -> Dict[str, Any]:
         """Analisa performance das marcas"""
         if df_marcas.empty:
             return {}
             
         total_vendas = df_marcas['vendas'].sum()
-        df_marcas['market_share'] = (df_marcas['vendas'] / total_vendas) * 100
+        # Colunas derivadas em cópia local: a entrada pode ser compartilhada
+        df_marcas = df_marcas.assign(market_share=(df_marcas['vendas'] / total_vendas) * 100)
         
         # Análise por categoria
         vendas_por_categoria = df_marcas.groupby('categoria')['vendas'].agg(['sum', 'count', 'mean']).reset_index()
@@ -107,6 +113,7 @@ class VendasAnalytics:
         }
     
     @staticmethod
+    @cached_analytics
     def analyze_store_performance(df_lojas: pd.DataFrame) -> Dict[str, Any]:
         """Analisa performance das lojas"""
         if df_lojas.empty:
@@ -137,6 +144,7 @@ class VendasAnalytics:
         }
     
     @staticmethod
+    @cached_analytics
     def analyze_visits_patterns(df_visitas: pd.DataFrame) -> Dict[str, Any]:
         """Analisa padrões de visitas"""
         if df_visitas.empty:
@@ -194,6 +202,7 @@ class VendasAnalytics:
         return recomendacoes
     
     @staticmethod
+    @cached_analytics
     def calculate_roi_metrics(df_mensal: pd.DataFrame, investimento_marketing: float = None) -> Dict[str, float]:
         """Calcula métricas de ROI"""
         if df_mensal.empty:
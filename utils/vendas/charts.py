@@ -3,10 +3,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from utils.core.cache import cached_figure
+
 class VendasCharts:
     """Gráficos para análise de vendas"""
     
     @staticmethod
+    @cached_figure
     def create_monthly_performance(df_mensal):
         """Cria gráfico de performance mensal"""
         if df_mensal.empty:
@@ -31,6 +34,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_brazil_map(df_estados):
         """Cria mapa do Brasil com vendas por estado - FUNCIONAL"""
         if df_estados.empty:
@@ -49,8 +53,9 @@ class VendasCharts:
         
         # Adicionar coordenadas ao DataFrame
         df_map = df_estados.copy()
-        df_map['lat'] = df_map['uf'].map(lambda x: state_coords.get(x, [0, 0])[0])
-        df_map['lon'] = df_map['uf'].map(lambda x: state_coords.get(x, [0, 0])[1])
+        ufs = df_map['uf'].astype(str)
+        df_map['lat'] = ufs.map(lambda x: state_coords.get(x, [0, 0])[0])
+        df_map['lon'] = ufs.map(lambda x: state_coords.get(x, [0, 0])[1])
         
         # Criar mapa de bolhas - SEMPRE FUNCIONA
         fig = px.scatter_geo(
@@ -85,6 +90,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_heatmap_table(df_estados):
         """Cria heatmap em formato de tabela - ALTERNATIVA PRÁTICA"""
         if df_estados.empty:
@@ -114,6 +120,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_states_bar_chart(df_estados):
         """Cria gráfico de barras por estado"""
         if df_estados.empty:
@@ -133,6 +140,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_regions_pie_chart(df_estados):
         """Cria gráfico de pizza por região"""
         if df_estados.empty:
@@ -153,6 +161,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_brands_analysis(df_marcas):
         """Cria análise por marca"""
         if df_marcas.empty:
@@ -172,6 +181,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_category_pie_chart(df_marcas):
         """Cria gráfico de pizza por categoria"""
         if df_marcas.empty:
@@ -188,6 +198,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_stores_ranking(df_lojas):
         """Cria ranking de lojas"""
         if df_lojas.empty:
@@ -207,6 +218,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_visits_trend(df_visitas):
         """Cria tendência de visitas"""
         if df_visitas.empty:
@@ -233,6 +245,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_conversion_trend(df_mensal):
         """Cria tendência de conversão"""
         if df_mensal.empty:
@@ -250,6 +263,7 @@ class VendasCharts:
         return fig
     
     @staticmethod
+    @cached_figure
     def create_ticket_medio_chart(df_mensal):
         """Cria gráfico de ticket médio"""
         if df_mensal.empty:
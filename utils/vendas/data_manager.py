@@ -1,6 +1,15 @@
 import pandas as pd
-import streamlit as st
 from typing import Dict, List, Any
+from utils.core.dataset_store import DatasetStore
+from utils.core.data_sources import DataSource, MemoryDataSource, get_configured_source, load_with_fallback
+from utils.core.kpis import KpiAccumulator
+
+
+def _session_store() -> DatasetStore:
+    # Importado sob demanda: o módulo também é usado sem Streamlit (python -m utils.cli)
+    from utils.import_helpers import get_dataset_store
+    return get_dataset_store()
+
 
 class VendasDataManager:
     """Gerenciador específico para dados de vendas"""
@@ -63,28 +72,56 @@ class VendasDataManager:
         'dados_visitas': DEFAULT_VISITAS_DATA
     }
 
+    KPI_MENSAL = KpiAccumulator('dados_mensais', sum_columns=['receita', 'vendas', 'leads'])
+
+    TABLE_KEYS = {
+        'mensal': 'dados_mensais',
+        'estados': 'dados_estados',
+        'marcas': 'dados_marcas',
+        'lojas': 'dados_lojas',
+        'visitas': 'dados_visitas'
+    }
+
+    @staticmethod
+    def get_data_source() -> DataSource:
+        """Fonte de dados ativa: banco configurado (DATABASE_URL) ou dados padrão"""
+        return get_configured_source() or MemoryDataSource(VendasDataManager.DATA_MAPPINGS)
+
     @staticmethod
     def initialize_session_data():
-        """Inicializa dados de vendas na session_state"""
+        """Inicializa dados de vendas (base compartilhada do processo)"""
+        store = _session_store()
+        source = None
         for data_key, default_data in VendasDataManager.DATA_MAPPINGS.items():
-            if data_key not in st.session_state:
-                st.session_state[data_key] = default_data
+            if data_key in store.base:
+                continue
+            # Cópia única por processo; a sessão só guarda suas próprias alterações
+            source = source or VendasDataManager.get_data_source()
+            store.base.register(data_key, load_with_fallback(source, data_key, default_data))
 
     @staticmethod
-    def get_dataframes() -> Dict[str, pd.DataFrame]:
-        """Retorna todos os dados de vendas como DataFrames"""
-        return {
-            'mensal': pd.DataFrame(st.session_state.dados_mensais),
-            'estados': pd.DataFrame(st.session_state.dados_estados),
-            'marcas': pd.DataFrame(st.session_state.dados_marcas),
-            'lojas': pd.DataFrame(st.session_state.dados_lojas),
-            'visitas': pd.DataFrame(st.session_state.dados_visitas)
-        }
+    def get_dataframes(source: DataSource = None, store: DatasetStore = None) -> Dict[str, pd.DataFrame]:
+        """
+        Retorna todos os dados de vendas como DataFrames (visões somente leitura).
+        Se uma fonte for informada, os dados são lidos diretamente dela; sem
+        store, usa o da sessão.
+        """
+        if source is not None:
+            loaded = source.load_many(VendasDataManager.TABLE_KEYS.values())
+            return {
+                name: loaded[data_key] if loaded[data_key] is not None else pd.DataFrame()
+                for name, data_key in VendasDataManager.TABLE_KEYS.items()
+            }
+        
+        store = store if store is not None else _session_store()
+        return {name: store.get_frame(data_key) for name, data_key in VendasDataManager.TABLE_KEYS.items()}
 
     @staticmethod
-    def calculate_kpis() -> Dict[str, float]:
-        """Calcula KPIs específicos de vendas"""
-        if 'dados_mensais' not in st.session_state:
+    def calculate_kpis(store: DatasetStore = None) -> Dict[str, float]:
+        """Calcula KPIs específicos de vendas (store da sessão por padrão)"""
+        store = store if store is not None else _session_store()
+        table = store.get_table('dados_mensais')
+        if table is None:
             return {
                 'total_receita': 0,
                 'total_vendas': 0,
@@ -92,9 +129,11 @@ class VendasDataManager:
                 'conversao_media': 0
             }
             
-        total_receita = sum(item['receita'] for item in st.session_state.dados_mensais)
-        total_vendas = sum(item['vendas'] for item in st.session_state.dados_mensais)
-        total_leads = sum(item['leads'] for item in st.session_state.dados_mensais)
+        # Incremental: em "Adicionar Linhas" só as linhas novas são processadas
+        state = VendasDataManager.KPI_MENSAL.compute(table)
+        total_receita = state.sums['receita']
+        total_vendas = state.sums['vendas']
+        total_leads = state.sums['leads']
         conversao_media = (total_vendas / total_leads) * 100 if total_leads > 0 else 0
         
         return {
@@ -107,7 +146,7 @@ class VendasDataManager:
     @staticmethod
     def get_monthly_summary() -> Dict[str, Any]:
         """Retorna resumo mensal para análises"""
-        df_mensal = pd.DataFrame(st.session_state.dados_mensais)
+        df_mensal = _session_store().get_frame('dados_mensais')
         
         if df_mensal.empty:
             return {}
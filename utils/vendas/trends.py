@@ -0,0 +1,142 @@
+"""
+Tendências de várias séries de uma vez (estados, marcas, lojas x meses).
+
+As séries são organizadas em uma matriz (série x período) e processadas em
+lote, sem laço por série:
+
+- inclinação: mínimos quadrados em forma fechada sobre todas as linhas
+  (equivale a np.polyfit(x, y, 1)[0] por série; períodos sem valor são ignorados)
+- médias móveis: soma direta de cada janela (sliding_window_view), com a
+  mesma semântica de rolling(window, min_periods).mean(); somas acumuladas
+  perderiam precisão depois de valores de magnitude muito maior na série
+- melhor/pior período: nanargmax/nanargmin por linha (primeira ocorrência)
+
+TrendEngine.summarize e TrendEngine.moving_averages são API de biblioteca
+(séries por estado/marca/loja a partir de tabelas de fatos); as páginas
+usam apenas as funções em lote via VendasAnalytics.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Sequence, Tuple
+
+
+def pivot_series(frame: pd.DataFrame, key_column: str, period_column: str, value_column: str,
+                 periods: Sequence = None) -> pd.DataFrame:
+    """
+    Matriz série x período (linhas repetidas são somadas, combinações
+    ausentes ficam NaN). Sem periods, os períodos seguem a ordem em que
+    aparecem nos dados.
+    """
+    keys = pd.Categorical(frame[key_column])
+    period_index = pd.Index(pd.unique(frame[period_column]) if periods is None else periods)
+    period_codes = period_index.get_indexer(frame[period_column])
+    values = pd.to_numeric(frame[value_column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+    valid = (keys.codes >= 0) & (period_codes >= 0) & ~np.isnan(values)
+    cells = len(keys.categories) * len(period_index)
+    flat = keys.codes[valid].astype(np.int64) * len(period_index) + period_codes[valid]
+    sums = np.bincount(flat, weights=values[valid], minlength=cells)
+    counts = np.bincount(flat, minlength=cells)
+    matrix = np.where(counts > 0, sums, np.nan).reshape(len(keys.categories), len(period_index))
+    return pd.DataFrame(matrix, index=pd.Index(keys.categories, name=key_column), columns=period_index)
+
+
+def batch_slopes(matrix: np.ndarray) -> np.ndarray:
+    """Inclinação da reta de mínimos quadrados de cada linha (x = 0..T-1); NaN com menos de 2 pontos"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype='float64'))
+    mask = ~np.isnan(matrix)
+    n = mask.sum(axis=1)
+    x = np.broadcast_to(np.arange(matrix.shape[1], dtype='float64'), matrix.shape)
+    y = np.where(mask, matrix, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = (x * mask).sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0.0)
+        sxy = (dx * (y - y_mean[:, None])).sum(axis=1)
+        sxx = (dx * dx).sum(axis=1)
+        slopes = sxy / sxx
+    slopes[(n < 2) | (sxx == 0)] = np.nan
+    return slopes
+
+
+def rolling_means(matrix: np.ndarray, window: int, min_periods: int = 1) -> np.ndarray:
+    """Média móvel de cada linha somando cada janela (NaN ignorado, como no pandas)"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype='float64'))
+    mask = ~np.isnan(matrix)
+    # Janela i = períodos (i - window, i]; o preenchimento à esquerda cobre o início da série
+    pad = ((0, 0), (window - 1, 0))
+    values = sliding_window_view(np.pad(np.where(mask, matrix, 0.0), pad), window, axis=1)
+    counts = sliding_window_view(np.pad(mask, pad), window, axis=1)
+    window_sums = values.sum(axis=2)
+    window_counts = counts.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = window_sums / window_counts
+    means[window_counts < max(min_periods, 1)] = np.nan
+    return means
+
+
+def extreme_periods(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Posição do maior e do menor valor de cada linha (-1 em linhas sem valores)"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype='float64'))
+    empty = np.isnan(matrix).all(axis=1)
+    best = np.argmax(np.where(np.isnan(matrix), -np.inf, matrix), axis=1)
+    worst = np.argmin(np.where(np.isnan(matrix), np.inf, matrix), axis=1)
+    best[empty] = -1
+    worst[empty] = -1
+    return best, worst
+
+
+class TrendEngine:
+    """Tendências, médias móveis e extremos por chave de dimensão"""
+
+    @staticmethod
+    def matrices(frame: pd.DataFrame, key_column: str, period_column: str, value_columns: List[str],
+                 periods: Sequence = None) -> Dict[str, pd.DataFrame]:
+        """Uma matriz série x período por métrica, todas com as mesmas linhas e colunas"""
+        period_index = pd.Index(pd.unique(frame[period_column]) if periods is None else periods)
+        return {
+            value_column: pivot_series(frame, key_column, period_column, value_column, period_index)
+            for value_column in value_columns
+        }
+
+    @staticmethod
+    def summarize(frame: pd.DataFrame, key_column: str, period_column: str, value_columns: List[str],
+                  window: int = 3, periods: Sequence = None) -> pd.DataFrame:
+        """
+        Uma linha por chave (ex.: estado) com, para cada métrica:
+        tendencia_<m>, media_movel_<m> (último período), melhor_periodo_<m>,
+        melhor_<m>, pior_periodo_<m> e pior_<m>.
+        """
+        matrices = TrendEngine.matrices(frame, key_column, period_column, value_columns, periods)
+        first = next(iter(matrices.values()))
+        keys, labels = first.index, first.columns.to_numpy(dtype=object)
+        stacked = np.vstack([matrix.to_numpy() for matrix in matrices.values()])
+
+        # Um único ajuste e uma única passada de médias móveis para todas as métricas e séries
+        slopes = batch_slopes(stacked).reshape(len(value_columns), len(keys))
+        moving = rolling_means(stacked, window)[:, -1].reshape(len(value_columns), len(keys))
+        best, worst = extreme_periods(stacked)
+        rows = np.arange(stacked.shape[0])
+        best_values = np.where(best >= 0, stacked[rows, best], np.nan).reshape(len(value_columns), len(keys))
+        worst_values = np.where(worst >= 0, stacked[rows, worst], np.nan).reshape(len(value_columns), len(keys))
+        best_labels = np.where(best >= 0, labels[best], None).reshape(len(value_columns), len(keys))
+        worst_labels = np.where(worst >= 0, labels[worst], None).reshape(len(value_columns), len(keys))
+
+        columns = {}
+        for position, value_column in enumerate(value_columns):
+            columns[f'tendencia_{value_column}'] = slopes[position]
+            columns[f'media_movel_{value_column}'] = moving[position]
+            columns[f'melhor_periodo_{value_column}'] = best_labels[position]
+            columns[f'melhor_{value_column}'] = best_values[position]
+            columns[f'pior_periodo_{value_column}'] = worst_labels[position]
+            columns[f'pior_{value_column}'] = worst_values[position]
+        return pd.DataFrame(columns, index=keys)
+
+    @staticmethod
+    def moving_averages(frame: pd.DataFrame, key_column: str, period_column: str, value_column: str,
+                        window: int = 3, periods: Sequence = None) -> pd.DataFrame:
+        """Médias móveis série x período de uma métrica"""
+        matrix = pivot_series(frame, key_column, period_column, value_column, periods)
+        return pd.DataFrame(rolling_means(matrix.to_numpy(), window), index=matrix.index, columns=matrix.columns)